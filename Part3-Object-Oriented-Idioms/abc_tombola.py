@@ -1,4 +1,8 @@
 import abc
+import bisect
+from collections import abc as collections_abc
+import itertools
+import math
 import random
 
 
@@ -10,6 +14,29 @@ class Tombola(abc.ABC):
     and classes claim to implement an interface by subclassing
     and ABC or by registering with it -- without requring
     the strong and static link of an inheritance relationship.
+
+    A subclass with only load() and pick() gets every other method, and
+    stays truthy even when empty: the ABC does not make it sized
+
+    >>> class Urn(Tombola):
+    ...     def __init__(self, items):
+    ...         self._items = list(items)
+    ...     def load(self, iterable):
+    ...         self._items.extend(iterable)
+    ...     def pick(self):
+    ...         if not self._items:
+    ...             raise LookupError('pick from empty Urn')
+    ...         return self._items.pop()
+    >>> urn = Urn('abc')
+    >>> urn.loaded(), urn.inspect(), len(urn.pick_many(2))
+    (True, ('a', 'b', 'c'), 2)
+    >>> urn.pick_many(2)
+    Traceback (most recent call last):
+      ...
+    LookupError: cannot pick 2 items from Urn with 1
+    >>> empty = Urn([])
+    >>> bool(empty), empty.loaded(), hasattr(empty, '__len__')
+    (True, False, False)
     """
 
     @abc.abstractmethod
@@ -35,10 +62,36 @@ class Tombola(abc.ABC):
         interface defined by the ABC.
 
         Return `True` if there's at least 1 item, False otherwise"""
+        if _sized(self):
+            return bool(len(self))
         return bool(self.inspect())
 
     def inspect(self):
         """Return a sorted tuple with the items currently inside"""
+        return tuple(sorted(self.snapshot()))
+
+    def pick_many(self, k):
+        """Remove k items at random, returning them in a list.
+
+        All or nothing: with fewer than k items inside, raise `LookupError`
+        and leave the instance as it was. This default can only call pick()
+        k times; concrete classes should override it with a batched version."""
+        _check_count(k)
+        size = len(self) if _sized(self) else len(self.snapshot())
+        if k > size:
+            raise LookupError(_too_many(self, k, size))
+        return [self.pick() for _ in range(k)]
+
+    def snapshot(self):
+        """Return a new list with the items currently inside, in no particular order.
+
+        This default can only rely on the ABC interface: it drains the
+        instance through pick() and loads the items back. Concrete classes
+        that know where their items are should override it with a
+        non-destructive version, and may define __len__ as a fast path.
+
+        Tombola itself defines no __len__: that would make ``if tombola:``
+        drain and reload every subclass that does not override it."""
         items = []
         while True:
             try:
@@ -46,10 +99,59 @@ class Tombola(abc.ABC):
             except LookupError:
                 break
         self.load(items)
-        return tuple(sorted(items))
+        return items
+
+
+def _sized(tombola):
+    """Whether the class of tombola defines __len__, a non-destructive fast path"""
+    return isinstance(tombola, collections_abc.Sized)
+
+
+def _check_count(k):
+    if k < 0:
+        raise ValueError('cannot pick a negative number of items: {}'.format(k))
+
+
+def _too_many(tombola, k, size):
+    return 'cannot pick {} items from {} with {}'.format(k, type(tombola).__name__, size)
+
+
+def _pick_tail(items, k, tombola):
+    """Remove the last k items of a list, in the order pop() would return them"""
+    _check_count(k)
+    if k > len(items):
+        raise LookupError(_too_many(tombola, k, len(items)))
+    split = len(items) - k
+    picked = items[split:]
+    del items[split:]
+    picked.reverse()
+    return picked
+
+
+def _shuffle_tail(items, k):
+    """Partial Fisher-Yates: move k items chosen at random to the end of the list"""
+    size = len(items)
+    randrange = random.randrange
+    for last in range(size - 1, size - 1 - min(k, size), -1):
+        position = randrange(last + 1)
+        items[position], items[last] = items[last], items[position]
 
 
 class BingoCage(Tombola):
+    """
+    >>> cage = BingoCage(range(3))
+    >>> len(cage), cage.loaded(), cage.inspect()
+    (3, True, (0, 1, 2))
+    >>> sorted(cage.snapshot()) == sorted(cage.snapshot()) == [0, 1, 2]
+    True
+    >>> cage.pick_many(4)
+    Traceback (most recent call last):
+      ...
+    LookupError: cannot pick 4 items from BingoCage with 3
+    >>> sorted(cage.pick_many(2) + cage.pick_many(1)), len(cage)
+    ([0, 1, 2], 0)
+    """
+
     def __init__(self, items):
         self._randomizer = random.SystemRandom()
         self._items = []
@@ -65,6 +167,16 @@ class BingoCage(Tombola):
         except IndexError:
             raise LookupError('pick from empty BingoCage')
 
+    def pick_many(self, k):
+        """The items are shuffled already: slice k off the tail"""
+        return _pick_tail(self._items, k, self)
+
+    def snapshot(self):
+        return list(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
     def __call__(self):
         self.pick()
 
@@ -77,11 +189,21 @@ class LotteryBlower(Tombola):
         self._balls.extend(iterable)
 
     def pick(self):
+        """Swap the random ball with the last one, then pop the last: O(1),
+        where pop(position) would shift the whole tail of the list"""
+        balls = self._balls
         try:
-            position = random.randrange(len(self._balls))
+            position = random.randrange(len(balls))
         except ValueError:
             raise LookupError('pick from empty LotteryBlower')
-        return self._balls.pop(position)
+        balls[position], balls[-1] = balls[-1], balls[position]
+        return balls.pop()
+
+    def pick_many(self, k):
+        """Shuffle k random balls to the tail, then slice them off"""
+        if 0 <= k <= len(self._balls):
+            _shuffle_tail(self._balls, k)
+        return _pick_tail(self._balls, k, self)
 
     def loaded(self):
         return bool(self._balls)
@@ -89,6 +211,328 @@ class LotteryBlower(Tombola):
     def inspect(self):
         return tuple(sorted(self._balls))
 
+    def snapshot(self):
+        return list(self._balls)
+
+    def __len__(self):
+        return len(self._balls)
+
+
+class WeightedTombola(Tombola):
+    """
+    A Tombola whose items are picked with probability proportional to a weight
+
+    Loading an item n times into a BingoCage to give it weight n costs n
+    slots. WeightedTombola keeps one slot and one weight per item:
+
+    - pick() draws WITHOUT replacement in O(log N), walking down a Fenwick
+      tree of the weights, then setting the picked weight to 0
+    - choice() draws WITH replacement in O(1), through Vose's alias table,
+      which is rebuilt in O(N) after a load or a pick
+
+    Items are loaded with weights, with a mapping of item -> weight, or with
+    bulk (item, weight) pairs; items loaded without weights weigh 1:
+
+    >>> prizes = WeightedTombola(['car', 'bike', 'pen'], weights=[1, 10, 989])
+    >>> len(prizes), prizes.inspect()
+    (3, ('bike', 'car', 'pen'))
+    >>> prizes.load_pairs([('cap', 200)])
+    >>> prizes.load({'mug': 300})
+    >>> prizes.weight('mug'), len(prizes)
+    (300, 5)
+    >>> draws = [prizes.choice() for _ in range(10000)]
+    >>> 0.6 < draws.count('pen') / len(draws) < 0.72 and len(prizes) == 5  # p = 989/1500
+    True
+    >>> prizes.pick_many(6)  # the Tombola default: all or nothing
+    Traceback (most recent call last):
+      ...
+    LookupError: cannot pick 6 items from WeightedTombola with 5
+    >>> prizes.inspect()
+    ('bike', 'cap', 'car', 'mug', 'pen')
+    >>> sorted(prizes.pick_many(4) + [prizes.pick()])
+    ['bike', 'cap', 'car', 'mug', 'pen']
+    >>> prizes.loaded(), prizes.inspect()
+    (False, ())
+    >>> prizes.pick()
+    Traceback (most recent call last):
+      ...
+    LookupError: pick from empty WeightedTombola
+    >>> prizes.load(['x'], weights=[0])
+    Traceback (most recent call last):
+      ...
+    ValueError: weights must be positive finite numbers, got 0
+
+    Extreme weight ratios: 1e16 + 1 rounds to 1e16, so once 'big' is out the
+    tree is rebuilt from the weights left, and 'a' and 'b' stay equally likely:
+
+    >>> seconds = []
+    >>> for _ in range(400):
+    ...     lopsided = WeightedTombola(['big', 'a', 'b'], weights=[1e16, 1, 1])
+    ...     seconds.append(lopsided.pick_many(3)[1])
+    >>> seconds.count('big'), 140 < seconds.count('a') < 260
+    (0, True)
+    >>> sorted(WeightedTombola(['big', 'small'], weights=[1e300, 1e-300]).pick_many(2))
+    ['big', 'small']
+
+    Like every Tombola::
+
+    >>> balls = list(range(3))
+    >>> globe = WeightedTombola(balls)
+    >>> globe.loaded(), globe.inspect()
+    (True, (0, 1, 2))
+    >>> sorted(globe.pick() for _ in balls), globe.loaded()
+    ([0, 1, 2], False)
+    >>> globe.load(balls)
+    >>> globe.inspect() == tuple(balls)
+    True
+    """
+
+    PRECISION = 2 ** -20  # rebuild when the total falls below this share of the last build
+
+    def __init__(self, items=(), weights=None):
+        self._items = []
+        self._weights = []
+        self._tree = [0.0]  # Fenwick tree over _weights, 1-based
+        self._total = 0.0
+        self._count = 0
+        self._alias = None
+        self.load(items, weights)
+
+    def load(self, iterable, weights=None):
+        if isinstance(iterable, collections_abc.Mapping):
+            pairs = iterable.items()
+        else:
+            pairs = zip(iterable, itertools.repeat(1) if weights is None else weights)
+        self.load_pairs(pairs)
+
+    def load_pairs(self, pairs):
+        """Bulk load of (item, weight) pairs: O(N) for the whole tree"""
+        items, weights = [], []
+        for item, weight in pairs:
+            if not 0 < weight < math.inf:
+                msg = 'weights must be positive finite numbers, got {!r}'
+                raise ValueError(msg.format(weight))
+            items.append(item)
+            weights.append(weight)
+        # drop the slots of picked items, then rebuild the tree bottom-up
+        live = [(i, w) for i, w in zip(self._items, self._weights) if w]
+        self._items = [i for i, _ in live] + items
+        self._weights = [w for _, w in live] + weights
+        tree = [0.0] + self._weights
+        size = len(self._weights)
+        for i in range(1, size + 1):
+            parent = i + (i & -i)
+            if parent <= size:
+                tree[parent] += tree[i]
+        self._tree = tree
+        self._total = self._rebuilt_total = math.fsum(self._weights)
+        self._count = size
+        self._alias = None
+
+    def weight(self, item):
+        for candidate, weight in zip(self._items, self._weights):
+            if weight and candidate == item:
+                return weight
+        raise KeyError(item)
+
+    def _find(self, target):
+        """The index i of the item where the prefix sums of weights pass target"""
+        tree, size = self._tree, len(self._weights)
+        position, step = 0, 1 << size.bit_length()
+        while step:
+            following = position + step
+            if following <= size and tree[following] <= target:
+                position = following
+                target -= tree[following]
+            step >>= 1
+        return position
+
+    def _scan(self, target):
+        """Like _find, summing the live weights one by one: O(N), but exact"""
+        index = None
+        for i, weight in enumerate(self._weights):
+            if weight:
+                index = i
+                target -= weight
+                if target < 0:
+                    break
+        return index
+
+    def pick(self):
+        if not self._count:
+            raise LookupError('pick from empty WeightedTombola')
+        index = self._find(random.random() * self._total)
+        if not (index < len(self._weights) and self._weights[index]):
+            # rounding landed past the end, or on a picked item: rebuild the
+            # tree from the live weights, and scan if even that misses
+            self.load_pairs(())
+            index = self._find(random.random() * self._total)
+            if not (index < len(self._weights) and self._weights[index]):
+                index = self._scan(random.random() * self._total)
+        item, weight, self._weights[index] = self._items[index], self._weights[index], 0
+        position = index + 1
+        while position < len(self._tree):
+            self._tree[position] -= weight
+            position += position & -position
+        self._count -= 1
+        self._total = self._total - weight if self._count else 0.0
+        self._alias = None
+        # a node that summed a huge weight and tiny ones lost the tiny ones to
+        # rounding, and subtracting the huge one does not bring them back:
+        # rebuild once the total is far below the one the tree was built with
+        if self._count and self._total < self._rebuilt_total * self.PRECISION:
+            self.load_pairs(())
+        return item
+
+    def _build_alias(self):
+        """Vose's alias method: every column holds one item, or two"""
+        live = [(item, weight) for item, weight in zip(self._items, self._weights) if weight]
+        size = len(live)
+        scale = size / math.fsum(weight for _, weight in live)
+        probabilities = [weight * scale for _, weight in live]
+        aliases = list(range(size))
+        small = [i for i, p in enumerate(probabilities) if p < 1]
+        large = [i for i, p in enumerate(probabilities) if p >= 1]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            aliases[less] = more
+            probabilities[more] -= 1 - probabilities[less]
+            (small if probabilities[more] < 1 else large).append(more)
+        for i in itertools.chain(small, large):  # leftovers are 1 up to rounding
+            probabilities[i] = 1.0
+        return [item for item, _ in live], probabilities, aliases
+
+    def choice(self):
+        """A random item, left in place: sampling with replacement"""
+        if not self._count:
+            raise LookupError('choice from empty WeightedTombola')
+        if self._alias is None:
+            self._alias = self._build_alias()
+        items, probabilities, aliases = self._alias
+        column = random.randrange(len(items))
+        if random.random() < probabilities[column]:
+            return items[column]
+        return items[aliases[column]]
+
+    def snapshot(self):
+        return [item for item, weight in zip(self._items, self._weights) if weight]
+
+    def __len__(self):
+        return self._count
+
+
+class RangeTombola(Tombola):
+    """
+    A Tombola over ranges of numbers, never materialized
+
+    ``BingoCage(range(10**9))`` builds and shuffles a list of a billion ints
+    before the first pick. RangeTombola keeps its items as a list of
+    segments -- ranges, kept as is, and lists for loose items -- that form
+    one virtual sequence of slots. pick() runs Fisher-Yates lazily: it draws
+    a random live slot and moves the value of the last live slot into it.
+    Only moved values are stored, in a dict, so memory grows with the number
+    of picks, not with the number of items:
+
+    >>> tickets = RangeTombola(range(10 ** 12))
+    >>> len(tickets)
+    1000000000000
+    >>> picked = [tickets.pick() for _ in range(1000)]
+    >>> len(set(picked)), all(0 <= n < 10 ** 12 for n in picked), len(tickets)
+    (1000, True, 999999999000)
+    >>> len(tickets._moved) <= 1000
+    True
+
+    Unions of ranges, and loose items, load the same way:
+
+    >>> seats = RangeTombola([range(1, 4), range(100, 400, 100)])
+    >>> seats.load([7, 8])
+    >>> seats.inspect()
+    (1, 2, 3, 7, 8, 100, 200, 300)
+    >>> sorted(seats.pick() for _ in range(8))
+    [1, 2, 3, 7, 8, 100, 200, 300]
+    >>> seats.loaded()
+    False
+    >>> seats.pick()
+    Traceback (most recent call last):
+      ...
+    LookupError: pick from empty RangeTombola
+
+    Loading after picks keeps the items left, and nothing else:
+
+    >>> seats.load(range(5))
+    >>> _ = [seats.pick() for _ in range(2)]
+    >>> seats.load(range(10, 12))
+    >>> len(seats), len(set(seats.snapshot()) & {0, 1, 2, 3, 4}), seats.inspect()[-2:]
+    (5, 3, (10, 11))
+    """
+
+    def __init__(self, items=()):
+        self._segments = []
+        self._starts = []  # slot number of the first item of every segment
+        self._moved = {}  # slot -> value, for the slots Fisher-Yates has moved values into
+        self._live = 0
+        self.load(items)
+
+    def load(self, iterable):
+        """Add the items of iterable; a range is added whole, as one segment,
+        and so is every range item of a list or other iterable"""
+        self._trim()
+        if isinstance(iterable, range):
+            iterable = [iterable]
+        loose = None
+        for item in iterable:
+            if isinstance(item, range):
+                self._segments.append(item)
+                loose = None
+            else:
+                if loose is None:
+                    loose = []
+                    self._segments.append(loose)
+                loose.append(item)
+        self._starts = list(itertools.accumulate(map(len, self._segments), initial=0))[:-1]
+        self._live = sum(map(len, self._segments))
+
+    def _trim(self):
+        """Cut the segments down to the live slots, 0 to _live - 1: slots
+        past them hold picked values, and loaded items must follow the live ones"""
+        segments, size = [], 0
+        for segment in self._segments:
+            if size + len(segment) >= self._live:
+                segments.append(segment[:self._live - size])
+                break
+            segments.append(segment)
+            size += len(segment)
+        self._segments = [segment for segment in segments if len(segment)]
+
+    def _value(self, slot):
+        """The value in a slot, as loaded: before any move"""
+        index = bisect.bisect_right(self._starts, slot) - 1
+        return self._segments[index][slot - self._starts[index]]
+
+    def _get(self, slot):
+        try:
+            return self._moved[slot]
+        except KeyError:
+            return self._value(slot)
+
+    def pick(self):
+        if not self._live:
+            raise LookupError('pick from empty RangeTombola')
+        slot = random.randrange(self._live)
+        last = self._live - 1
+        value = self._get(slot)
+        if slot != last:
+            self._moved[slot] = self._get(last)
+        self._moved.pop(last, None)
+        self._live = last
+        return value
+
+    def snapshot(self):
+        return [self._get(slot) for slot in range(self._live)]
+
+    def __len__(self):
+        return self._live
+
 
 @Tombola.register
 class TomboList(list):
@@ -112,15 +556,40 @@ class TomboList(list):
     True
     >>> TomboList.__mro__
     (<class 'abc_tombola.TomboList'>, <class 'list'>, <class 'object'>)
+    >>> picked = t.pick_many(60)
+    >>> len(picked), len(t), sorted(picked + t) == list(range(100))
+    (60, 40, True)
+    >>> t.pick_many(41)
+    Traceback (most recent call last):
+      ...
+    LookupError: cannot pick 41 items from TomboList with 40
+    >>> len(t.pick_many(40)), t.pick_many(0)
+    (40, [])
+    >>> t.pick_many(-1)
+    Traceback (most recent call last):
+      ...
+    ValueError: cannot pick a negative number of items: -1
+    >>> t.pick()
+    Traceback (most recent call last):
+      ...
+    LookupError: pick from empty TomboList
     """
 
     def pick(self):
         if self:
+            # swap-with-last, as in LotteryBlower.pick: O(1) instead of O(len)
             position = random.randrange(len(self))
-            return self.pop(position)
+            self[position], self[-1] = self[-1], self[position]
+            return self.pop()
         else:
             raise LookupError('pick from empty TomboList')
 
+    def pick_many(self, k):
+        # same partial shuffle as LotteryBlower.pick_many, on the list itself
+        if 0 <= k <= len(self):
+            _shuffle_tail(self, k)
+        return _pick_tail(self, k, self)
+
     load = list.extend
 
     def loaded(self):
@@ -128,3 +597,7 @@ class TomboList(list):
 
     def inspect(self):
         return tuple(sorted(self))
+
+    def snapshot(self):
+        # a virtual subclass inherits nothing from Tombola: no default to fall back on
+        return list(self)
@@ -0,0 +1,99 @@
+"""
+Benchmarks of the Tombola implementations: draining a full container, and
+drawing batches with pick() in a loop or with one pick_many(k)
+
+Run all of them with ``python benchmark_tombola.py``, or just some by name:
+``python benchmark_tombola.py drain``
+"""
+
+import random
+import sys
+import time
+
+from abc_tombola import BingoCage, LotteryBlower, RangeTombola, TomboList, WeightedTombola
+from operator_overloading import AddableBingoCage
+
+
+def clock(label, func, *args):
+    t0 = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - t0
+    print('  {:<40} {:10.4f}s'.format(label, elapsed))
+    return result
+
+
+class LegacyLotteryBlower(LotteryBlower):
+    """LotteryBlower as it picked before swap-with-last: pop(position), O(N)"""
+
+    def pick(self):
+        try:
+            position = random.randrange(len(self._balls))
+        except ValueError:
+            raise LookupError('pick from empty LotteryBlower')
+        return self._balls.pop(position)
+
+
+class LegacyTomboList(TomboList):
+    """TomboList as it picked before swap-with-last: pop(position), O(N)"""
+
+    def pick(self):
+        if self:
+            return self.pop(random.randrange(len(self)))
+        raise LookupError('pick from empty TomboList')
+
+
+def drain(tombola):
+    """Pick until empty, the way a full draw does"""
+    picked = []
+    while True:
+        try:
+            picked.append(tombola.pick())
+        except LookupError:
+            return picked
+
+
+IMPLEMENTATIONS = [BingoCage, AddableBingoCage, LotteryBlower, LegacyLotteryBlower,
+                   TomboList, LegacyTomboList, WeightedTombola, RangeTombola]
+
+
+def drain_run(sizes=(10 ** 4, 10 ** 5, 10 ** 6)):
+    """Time to pick every item, for every Tombola implementation"""
+    for size in sizes:
+        print('drain: {} items'.format(size))
+        for cls in IMPLEMENTATIONS:
+            tombola = cls(range(size))
+            picked = clock(cls.__name__, drain, tombola)
+            assert sorted(picked) == list(range(size))
+
+
+def first_pick_run(size=10 ** 7, picks=1000):
+    """Time to build a cage over range(size) and make the first picks"""
+    print('first picks: {} from range({})'.format(picks, size))
+    for cls in [BingoCage, RangeTombola]:
+        def build_and_pick():
+            tombola = cls(range(size))
+            return [tombola.pick() for _ in range(picks)]
+        clock(cls.__name__, build_and_pick)
+
+
+def batch_run(size=10 ** 6, k=1000):
+    """Time to draw every item in batches of k: a pick() loop vs pick_many(k)"""
+    print('batches: {} items, {} at a time'.format(size, k))
+    for cls in [BingoCage, AddableBingoCage, LotteryBlower, TomboList]:
+        def pick_loop(tombola):
+            return [[tombola.pick() for _ in range(k)] for _ in range(size // k)]
+
+        def pick_many(tombola):
+            return [tombola.pick_many(k) for _ in range(size // k)]
+
+        clock(cls.__name__ + ' pick() loop', pick_loop, cls(range(size)))
+        batches = clock(cls.__name__ + ' pick_many(k)', pick_many, cls(range(size)))
+        assert sorted(n for batch in batches for n in batch) == list(range(size))
+
+
+RUNS = {'drain': drain_run, 'first': first_pick_run, 'batch': batch_run}
+
+
+if __name__ == '__main__':
+    for name in sys.argv[1:] or RUNS:
+        RUNS[name]()
@@ -0,0 +1,155 @@
+"""
+Benchmarks of the Vector toolkit against the naive approaches they replace
+
+Run all of them with ``python benchmark_vector.py``, or just some by name:
+``python benchmark_vector.py knn``
+"""
+
+import heapq
+import io
+import math
+import pickle
+import random
+import sys
+import time
+
+from class_KDTree import KDTree, BruteForceIndex
+from class_QuadTree import QuadTree
+from class_Vector2d import Vector2d
+from operator_overloading import Vector2
+
+
+def clock(label, func, *args):
+    t0 = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - t0
+    print('  {:<40} {:10.4f}s'.format(label, elapsed))
+    return result
+
+
+def knn_run(size=10000, dims=(2, 3, 16), queries=20, k=5):
+    """knn over the indexes vs. sorting by abs(v + -q), the brute-force Python loop"""
+    print('knn: {} vectors, {} queries, k={}'.format(size, queries, k))
+    for dim in dims:
+        print(' dim={}'.format(dim))
+        vectors = [Vector2(random.random() for _ in range(dim)) for _ in range(size)]
+        targets = [Vector2(random.random() for _ in range(dim)) for _ in range(queries)]
+
+        def naive():
+            return [sorted(vectors, key=lambda v: abs(v + -q))[:k] for q in targets]
+
+        def search(index):
+            return [[v for _, v in index.knn(q, k)] for q in targets]
+
+        expected = clock('naive loop', naive)
+        tree = clock('KDTree build', KDTree, vectors)
+        brute = clock('BruteForceIndex build', BruteForceIndex, vectors)
+        assert clock('KDTree queries', search, tree) == expected
+        assert clock('BruteForceIndex queries', search, brute) == expected
+
+
+class LegacyVector2(Vector2):
+    """Vector2 pickled the way it was before __reduce_ex__: object's default reduce"""
+    __slots__ = ()
+    __reduce_ex__ = object.__reduce_ex__
+
+
+def pickle_run(dim=10 ** 6, rounds=20):
+    """Serialized size and round-trip time, default reduce vs. protocol 5 buffers"""
+    print('pickle: {} components, {} round trips'.format(dim, rounds))
+    components = [random.random() for _ in range(dim)]
+
+    def round_trips(vector, protocol, out_of_band):
+        for _ in range(rounds):
+            buffers = [] if out_of_band else None
+            data = pickle.dumps(vector, protocol=protocol,
+                                buffer_callback=buffers.append if out_of_band else None)
+            pickle.loads(data, buffers=buffers)
+        return len(data) + sum(len(memoryview(b).cast('B')) for b in buffers or [])
+
+    cases = [('default reduce, protocol 4', LegacyVector2, 4, False),
+             ('default reduce, protocol 5', LegacyVector2, 5, False),
+             ('__reduce_ex__, protocol 5 in-band', Vector2, 5, False),
+             ('__reduce_ex__, protocol 5 out-of-band', Vector2, 5, True)]
+    for label, cls, protocol, out_of_band in cases:
+        size = clock(label, round_trips, cls(components), protocol, out_of_band)
+        print('  {:<40} {:10d} bytes'.format('', size))
+
+
+def stream_run(count=10 ** 6, dim=16):
+    """Writing and reading many vectors: one bytes() per vector vs. framed blocks"""
+    print('stream: {} vectors of dimension {}'.format(count, dim))
+    vectors = [Vector2(random.random() for _ in range(dim)) for _ in range(count)]
+    size = len(bytes(vectors[0]))
+
+    def write_each():
+        f = io.BytesIO()
+        for vector in vectors:
+            f.write(bytes(vector))
+        return f
+
+    def read_each(f):
+        f.seek(0)
+        return [Vector2.frombytes(f.read(size)) for _ in range(count)]
+
+    def write_blocks():
+        f = io.BytesIO()
+        Vector2.dump_many(vectors, f)
+        return f
+
+    def read_blocks(f, copy):
+        f.seek(0)
+        return list(Vector2.iter_load(f, copy))
+
+    f = clock('bytes() per vector', write_each)
+    assert clock('frombytes() per vector', read_each, f) == vectors
+    f = clock('dump_many', write_blocks)
+    assert clock('iter_load', read_blocks, f, True) == vectors
+    assert clock('iter_load, copy=False', read_blocks, f, False) == vectors
+
+
+def quadtree_run(sizes=(10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7), queries=10, k=10):
+    """Rectangle, radius and knn queries: QuadTree vs. linear scans, as the set grows"""
+    print('quadtree: {} queries per kind, k={}'.format(queries, k))
+    for size in sizes:
+        print(' {} points'.format(size))
+        points = [Vector2d(random.random(), random.random()) for _ in range(size)]
+        # about 100 points per rectangle or circle, whatever the size
+        half = math.sqrt(25 / size)
+        r = math.sqrt(100 / size / math.pi)
+        centers = [(random.random(), random.random()) for _ in range(queries)]
+        boxes = [((x - half, y - half), (x + half, y + half)) for x, y in centers]
+
+        def scan_rectangles():
+            return [{p for p in points if lo[0] <= p.x <= hi[0] and lo[1] <= p.y <= hi[1]}
+                    for lo, hi in boxes]
+
+        def scan_radius():
+            return [{p for p in points if math.hypot(p.x - x, p.y - y) <= r} for x, y in centers]
+
+        def scan_knn():
+            return [heapq.nsmallest(k, (math.hypot(p.x - x, p.y - y) for p in points))
+                    for x, y in centers]
+
+        tree = clock('QuadTree bulk load', QuadTree, points)
+        expected = clock('linear scan: rectangles', scan_rectangles)
+        assert clock('QuadTree: rectangles',
+                     lambda: [set(tree.rectangle(*box)) for box in boxes]) == expected
+        expected = clock('linear scan: radius', scan_radius)
+        assert clock('QuadTree: radius',
+                     lambda: [set(tree.radius(c, r)) for c in centers]) == expected
+        expected = clock('linear scan: knn', scan_knn)
+        assert clock('QuadTree: knn',
+                     lambda: [[d for d, _ in tree.knn(c, k)] for c in centers]) == expected
+        extra = [Vector2d(random.random(), random.random()) for _ in range(1000)]
+        clock('QuadTree: 1000 inserts', lambda: [tree.insert(p) for p in extra])
+        clock('QuadTree: 1000 removes', lambda: [tree.remove(p) for p in extra])
+
+
+RUNS = {'knn': knn_run, 'pickle': pickle_run, 'stream': stream_run,
+        'quadtree': quadtree_run}
+
+
+if __name__ == '__main__':
+    for name in sys.argv[1:] or RUNS:
+        RUNS[name]()
@@ -0,0 +1,271 @@
+"""
+Nearest-neighbour indexes over collections of ``Vector`` instances
+
+Finding the k closest vectors with ``sorted(vectors, key=lambda v: abs(v + -q))``
+computes every distance through Python-level arithmetic, for every query.
+Two indexes share one interface -- ``insert``, ``knn``, ``radius`` and ``len``:
+
+- ``KDTree`` splits space on the median of its widest axis, down to leaf
+  buckets. It prunes whole subtrees, which pays off in low dimensions.
+- ``BruteForceIndex`` computes all the distances in one batch with
+  ``VectorArray.distances``. In high dimensions a KD-tree ends up visiting
+  almost every leaf anyway, so the vectorized scan wins there.
+
+``build_index`` picks one for the dimension of the data::
+
+    >>> from operator_overloading import Vector2
+    >>> points = [Vector2([x, y]) for x in range(10) for y in range(10)]
+    >>> index = build_index(points)
+    >>> index
+    KDTree(dim=2, size=100)
+    >>> for distance, point in index.knn([2.2, 3.1], 3):
+    ...     print('{:.4f} {}'.format(distance, point))
+    0.2236 (2.0, 3.0)
+    0.8062 (3.0, 3.0)
+    0.9220 (2.0, 4.0)
+    >>> sorted(index.radius([0, 0], 1.5), key=tuple)
+    [Vector([0.0, 0.0]), Vector([0.0, 1.0]), Vector([1.0, 0.0]), Vector([1.0, 1.0])]
+
+
+The stored objects themselves come back, and both kinds of index agree::
+
+    >>> index.knn([9, 9], 1)[0][1] is points[-1]
+    True
+    >>> brute = BruteForceIndex(points)
+    >>> brute.knn([2.2, 3.1], 3) == index.knn([2.2, 3.1], 3)
+    True
+    >>> set(brute.radius([0, 0], 1.5)) == set(index.radius([0, 0], 1.5))
+    True
+    >>> row = [Vector2([x, 0]) for x in (0, 1, 1, 1, 2)]  # duplicates on the split
+    >>> sorted(KDTree(row, leaf_size=2).radius([2, 0], 1), key=tuple)
+    [Vector([1.0, 0.0]), Vector([1.0, 0.0]), Vector([1.0, 0.0]), Vector([2.0, 0.0])]
+    >>> _ == sorted(BruteForceIndex(row).radius([2, 0], 1), key=tuple)
+    True
+    >>> build_index([Vector2(range(32))])
+    BruteForceIndex(dim=32, size=1)
+
+
+Incremental inserts::
+
+    >>> index.insert(Vector2([2.5, 3.5]))
+    >>> len(index), index.knn([2.4, 3.4], 1)[0][1]
+    (101, Vector([2.5, 3.5]))
+    >>> line = KDTree()
+    >>> for x in range(40000):  # sorted inserts: the tree rebalances as it grows
+    ...     line.insert([x, 0])
+    >>> line.knn([20000.25, 0], 2)
+    [(0.25, [20000, 0]), (0.75, [20001, 0])]
+    >>> index.knn([1, 2, 3], 1)
+    Traceback (most recent call last):
+      ...
+    ValueError: expected a vector of dimension 2, got 3
+"""
+
+from array import array
+import heapq
+import itertools
+import math
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional: fall back to array + builtins
+    numpy = None
+
+from class_VectorArray import VectorArray
+
+KDTREE_MAX_DIM = 10  # above this, KD-trees visit nearly every leaf: scan in batch instead
+
+
+class _Node:
+    """An inner node splits on ``axis`` at ``split`` and counts the points under
+    it in ``size``; a leaf holds ``points``, a list of (coordinates, stored
+    object) pairs, and is split once it holds more than ``limit`` of them"""
+    __slots__ = ('axis', 'split', 'left', 'right', 'size', 'points', 'limit')
+
+    def __init__(self, points=None, limit=0):
+        self.points = points
+        self.limit = limit
+
+    def count(self):
+        return self.size if self.points is None else len(self.points)
+
+    def entries(self):
+        """Every (coordinates, stored object) pair under this node"""
+        stack, found = [self], []
+        while stack:
+            node = stack.pop()
+            if node.points is None:
+                stack.extend((node.left, node.right))
+            else:
+                found.extend(node.points)
+        return found
+
+    def replace(self, other):
+        """Become other, in place: the parent keeps pointing at self"""
+        for name in _Node.__slots__:
+            setattr(self, name, getattr(other, name, None))
+
+
+class KDTree:
+    def __init__(self, vectors=(), leaf_size=16):
+        self.leaf_size = leaf_size
+        points = [(tuple(v), v) for v in vectors]
+        self.dim = len(points[0][0]) if points else None
+        self._size = len(points)
+        self._root = self._build(points)
+
+    def __len__(self):
+        return self._size
+
+    def __repr__(self):
+        return '{}(dim={}, size={})'.format(type(self).__name__, self.dim, self._size)
+
+    def _build(self, points):
+        """Bulk build: split on the median of the widest axis, O(n log**2 n)"""
+        if len(points) <= self.leaf_size:
+            return _Node(points, 2 * self.leaf_size)
+        spreads = [max(axis) - min(axis) for axis in zip(*(p for p, _ in points))]
+        axis = max(range(len(spreads)), key=spreads.__getitem__)
+        if not spreads[axis]:
+            # all points equal: nothing to split on. Try again only once the
+            # leaf doubles, or inserting duplicates rescans it every time
+            return _Node(points, 2 * len(points))
+        points.sort(key=lambda point: point[0][axis])
+        middle = len(points) // 2
+        node = _Node()
+        node.axis, node.split, node.size = axis, points[middle][0][axis], len(points)
+        node.left, node.right = self._build(points[:middle]), self._build(points[middle:])
+        return node
+
+    def _coords(self, vector):
+        coords = tuple(vector)
+        if self.dim is not None and len(coords) != self.dim:
+            msg = 'expected a vector of dimension {}, got {}'
+            raise ValueError(msg.format(self.dim, len(coords)))
+        return coords
+
+    def insert(self, vector):
+        coords = self._coords(vector)
+        if self.dim is None:
+            self.dim = len(coords)
+        path, node = [], self._root
+        while node.points is None:
+            node.size += 1
+            path.append(node)
+            node = node.left if coords[node.axis] < node.split else node.right
+        node.points.append((coords, vector))
+        self._size += 1
+        if len(node.points) > node.limit:
+            node.replace(self._build(node.points))  # split the overfull leaf
+        if len(path) > 2 * math.log2(self._size / self.leaf_size + 1) + 2:
+            # too deep, as after inserts in sorted order: rebuild the highest
+            # subtree on the path where one side holds over 3/4 of the points
+            for parent in path:
+                if max(parent.left.count(), parent.right.count()) > 3 / 4 * parent.size:
+                    parent.replace(self._build(parent.entries()))
+                    break
+
+    def knn(self, query, k):
+        """The k stored vectors closest to query, as (distance, vector) pairs, nearest first"""
+        query = self._coords(query)
+        heap = []  # max-heap of the k best so far: (-distance, tiebreaker, vector)
+        counter = itertools.count()
+        # depth-first with an explicit stack of (lower bound of the distance, node)
+        stack = [(0.0, self._root)] if k > 0 else []
+        while stack:
+            bound, node = stack.pop()
+            if len(heap) == k and bound >= -heap[0][0]:
+                continue
+            if node.points is not None:
+                for coords, vector in node.points:
+                    item = (-math.dist(query, coords), next(counter), vector)
+                    if len(heap) < k:
+                        heapq.heappush(heap, item)
+                    elif item > heap[0]:
+                        heapq.heapreplace(heap, item)
+                continue
+            delta = query[node.axis] - node.split
+            near, far = (node.left, node.right) if delta < 0 else (node.right, node.left)
+            stack.append((max(bound, abs(delta)), far))
+            stack.append((bound, near))  # popped first
+        return [(-d, vector) for d, _, vector in sorted(heap, reverse=True)]
+
+    def radius(self, query, r):
+        """All stored vectors at distance <= r from query"""
+        query = self._coords(query)
+        found, stack = [], [self._root]
+        while stack:
+            node = stack.pop()
+            if node.points is not None:
+                found.extend(v for coords, v in node.points if math.dist(query, coords) <= r)
+                continue
+            delta = query[node.axis] - node.split
+            if delta - r <= 0:  # ties with the split can be on the left too
+                stack.append(node.left)
+            if delta + r >= 0:
+                stack.append(node.right)
+        return found
+
+
+class BruteForceIndex:
+    def __init__(self, vectors=()):
+        self._vectors = []
+        self._flat = array('d')
+        self.dim = None
+        self._array = None
+        for vector in vectors:
+            self.insert(vector)
+
+    def __len__(self):
+        return len(self._vectors)
+
+    def __repr__(self):
+        return '{}(dim={}, size={})'.format(type(self).__name__, self.dim, len(self))
+
+    def insert(self, vector):
+        size = len(self._flat)
+        self._flat.extend(vector)
+        if self.dim is None:
+            self.dim = len(self._flat) - size
+        elif len(self._flat) - size != self.dim:
+            del self._flat[size:]
+            msg = 'expected a vector of dimension {}, got {}'
+            raise ValueError(msg.format(self.dim, len(vector)))
+        self._vectors.append(vector)
+        self._array = None  # rebuilt lazily: a batch of inserts costs one rebuild
+
+    def _distances(self, query):
+        if self._array is None:
+            # a copy: VectorArray views would lock self._flat against resizing
+            self._array = VectorArray.frombuffer(array('d', self._flat), self.dim)
+        return self._array.distances(query)
+
+    def knn(self, query, k):
+        """The k stored vectors closest to query, as (distance, vector) pairs, nearest first"""
+        distances = self._distances(query)
+        k = min(k, len(distances))
+        if k <= 0:
+            return []
+        if numpy is not None:
+            nearest = numpy.argpartition(distances, k - 1)[:k]
+            pairs = zip(distances[nearest].tolist(), nearest.tolist())
+            pairs = sorted(pairs)
+        else:
+            pairs = heapq.nsmallest(k, zip(distances, itertools.count()))
+        return [(d, self._vectors[i]) for d, i in pairs]
+
+    def radius(self, query, r):
+        """All stored vectors at distance <= r from query"""
+        distances = self._distances(query)
+        if numpy is not None:
+            return [self._vectors[i] for i in numpy.flatnonzero(distances <= r).tolist()]
+        return list(itertools.compress(self._vectors, (d <= r for d in distances)))
+
+
+def build_index(vectors, leaf_size=16):
+    """A KDTree for low-dimensional vectors, a BruteForceIndex otherwise"""
+    vectors = list(vectors)
+    dim = len(vectors[0]) if vectors else 0
+    if dim <= KDTREE_MAX_DIM:
+        return KDTree(vectors, leaf_size)
+    return BruteForceIndex(vectors)
@@ -0,0 +1,188 @@
+"""
+Locality-sensitive hashing: near-duplicate detection for ``Vector`` collections
+
+``hash(v)`` is exact, so vectors that differ in their last bit land in
+different dict buckets. LSH keys are coarse on purpose: close vectors get the
+same key with high probability, distant ones rarely do. Bucketing by several
+independent keys ("tables") turns the O(n**2) all-pairs comparison into
+comparisons within buckets only.
+
+- ``HyperplaneLSH``: one bit per random hyperplane, the side the vector is on.
+  Two vectors at angle t disagree on a bit with probability t / pi: cosine.
+- ``PStableLSH``: ``floor((a @ v + b) / width)`` for Gaussian a, the
+  2-stable distribution. Close points fall in the same slot: Euclidean.
+
+Both hash many vectors in batches, through NumPy when it is installed::
+
+    >>> from class_Vector import Vector
+    >>> lsh = HyperplaneLSH(dim=3, bits=8, tables=2, seed=42)
+    >>> a, b = lsh.keys([Vector([1, 2, 3]), Vector([2, 4, 6.01])])
+    >>> a == b  # nearly the same direction: same keys in all tables
+    True
+    >>> len(a), all(0 <= key < 2 ** 8 for key in a)
+    (2, True)
+
+
+``near_duplicates`` returns the (i, j) index pairs, i < j, whose distance is
+at most ``threshold``. Every candidate found through a shared bucket is
+checked with the exact distance, so there are no false positives; pairs
+missed by every table are possible, with a probability that the number of
+tables drives down::
+
+    >>> import random
+    >>> rnd = random.Random(7)
+    >>> base = [Vector(rnd.uniform(-1, 1) for _ in range(16)) for _ in range(200)]
+    >>> noisy = [Vector(x + rnd.uniform(-1e-4, 1e-4) for x in base[i]) for i in (3, 50, 199)]
+    >>> near_duplicates(base + noisy, 0.01, seed=1)
+    [(3, 200), (50, 201), (199, 202)]
+    >>> near_duplicates(base + [Vector(2 * x for x in base[9])], 1e-9, metric='cosine', seed=1)
+    [(9, 200)]
+    >>> import itertools
+    >>> pairs = [Vector(x + rnd.gauss(0, 0.2) for x in v) for v in base[:100]]
+    >>> close = [(i, j) for i, j in itertools.combinations(range(300), 2)
+    ...          if cosine_distance(*[(base + pairs)[k] for k in (i, j)]) <= 0.1]
+    >>> found = near_duplicates(base + pairs, 0.1, metric='cosine', seed=2)
+    >>> len(close) > 50, len(found) / len(close) > 0.95
+    (True, True)
+    >>> near_duplicates(base, 0.01, metric='manhattan')
+    Traceback (most recent call last):
+      ...
+    ValueError: unknown metric 'manhattan': use 'euclidean' or 'cosine'
+"""
+
+from array import array
+from collections import defaultdict
+import itertools
+import math
+import operator
+import random
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional: fall back to array + builtins
+    numpy = None
+
+from class_VectorArray import VectorArray
+
+CHUNK_SIZE = 4096  # vectors projected per NumPy batch
+
+
+class _RandomProjections:
+    """Projections of vectors onto ``count`` random Gaussian directions"""
+
+    def __init__(self, dim, count, rng):
+        self.dim = dim
+        gauss = rng.gauss
+        self._directions = VectorArray(([gauss(0.0, 1.0) for _ in range(dim)]
+                                        for _ in range(count)), dim)
+
+    def _project(self, vectors):
+        """Generate the list of projections of every vector"""
+        if numpy is not None:
+            directions = self._directions._rows.T
+            vectors = iter(vectors)
+            while True:
+                chunk = VectorArray(itertools.islice(vectors, CHUNK_SIZE), self.dim)
+                if not len(chunk):
+                    return
+                yield from (chunk._rows @ directions).tolist()
+        for vector in vectors:
+            vector = array('d', vector)
+            if len(vector) != self.dim:
+                msg = 'expected vectors of dimension {}, got {}'
+                raise ValueError(msg.format(self.dim, len(vector)))
+            yield (self._directions @ vector).tolist()
+
+
+class HyperplaneLSH(_RandomProjections):
+    """Random-hyperplane signatures: ``bits`` sign bits per table"""
+
+    def __init__(self, dim, bits=16, tables=8, seed=None):
+        super().__init__(dim, bits * tables, random.Random(seed))
+        self.bits = bits
+        self.tables = tables
+
+    def keys(self, vectors):
+        """Generate, for every vector, a tuple of one int key per table"""
+        weights = [1 << i for i in range(self.bits)] * self.tables
+        bounds = range(0, self.bits * self.tables, self.bits)
+        for projections in self._project(vectors):
+            bits = [w if p >= 0 else 0 for w, p in zip(weights, projections)]
+            yield tuple(sum(bits[start:start + self.bits]) for start in bounds)
+
+
+class PStableLSH(_RandomProjections):
+    """p-stable projections: ``hashes`` slot numbers of size ``width`` per table"""
+
+    def __init__(self, dim, width, hashes=4, tables=8, seed=None):
+        rng = random.Random(seed)
+        super().__init__(dim, hashes * tables, rng)
+        self.width = width
+        self.hashes = hashes
+        self.tables = tables
+        self._offsets = [rng.uniform(0, width) for _ in range(hashes * tables)]
+
+    def keys(self, vectors):
+        """Generate, for every vector, a tuple of one key per table"""
+        width = self.width
+        bounds = range(0, self.hashes * self.tables, self.hashes)
+        for projections in self._project(vectors):
+            slots = [math.floor((p + b) / width) for p, b in zip(projections, self._offsets)]
+            yield tuple(tuple(slots[start:start + self.hashes]) for start in bounds)
+
+
+def cosine_distance(a, b):
+    """1 - cosine of the angle between a and b; 1.0 when either is all zeros"""
+    norms = math.hypot(*a) * math.hypot(*b)
+    if not norms:
+        return 1.0
+    return 1 - sum(map(operator.mul, a, b)) / norms
+
+
+def _cosine_bits(threshold, limit=32):
+    """Bits per HyperplaneLSH key so that two vectors at cosine distance
+    threshold share a key with probability about 1/2, at most limit"""
+    angle = math.acos(max(-1.0, min(1.0, 1 - threshold)))
+    agree = 1 - angle / math.pi  # probability that one hyperplane bit agrees
+    if agree >= 1:
+        return limit
+    if agree <= 0.5:
+        return 1
+    return max(1, min(limit, math.floor(math.log(0.5) / math.log(agree))))
+
+
+def near_duplicates(vectors, threshold, metric='euclidean', tables=8, seed=None):
+    """Sorted (i, j) index pairs, i < j, of vectors at most threshold apart.
+    For 'cosine', the distance is ``cosine_distance``.
+
+    Both metrics size their keys from threshold so that a pair right at the
+    threshold shares a key in one table with probability about 1/2 (cosine)
+    or 0.4 (euclidean): with the default 8 tables, such a pair is missed
+    about 0.4% or 1.5% of the time. Closer pairs are missed less often"""
+    vectors = vectors if isinstance(vectors, list) else list(vectors)
+    if not vectors:
+        return []
+    dim = len(vectors[0])
+    if metric == 'euclidean':
+        # slots 4 thresholds wide: a pair at the threshold shares one with p ~ 0.8
+        family = PStableLSH(dim, 4 * threshold or 1.0, tables=tables, seed=seed)
+        distance = math.dist
+    elif metric == 'cosine':
+        family = HyperplaneLSH(dim, _cosine_bits(threshold), tables=tables, seed=seed)
+        distance = cosine_distance
+    else:
+        msg = "unknown metric {!r}: use 'euclidean' or 'cosine'"
+        raise ValueError(msg.format(metric))
+    buckets = [defaultdict(list) for _ in range(tables)]
+    for i, keys in enumerate(family.keys(vectors)):
+        for table, key in zip(buckets, keys):
+            table[key].append(i)
+    # check each bucket as it comes: memory grows with the matches, not with
+    # the candidates, which are quadratic in the size of a dense bucket
+    found = set()
+    for table in buckets:
+        for members in table.values():
+            for i, j in itertools.combinations(members, 2):
+                if (i, j) not in found and distance(vectors[i], vectors[j]) <= threshold:
+                    found.add((i, j))
+    return sorted(found)
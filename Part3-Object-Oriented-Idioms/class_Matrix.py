@@ -0,0 +1,175 @@
+"""
+A dense ``Matrix`` whose rows are stored back to back, like a ``VectorArray``
+
+``@`` between vectors is a dot product. Multiplying by a matrix as a list of
+row vectors would run one Python-level dot product per row, each walking the
+whole other operand. A ``Matrix`` keeps its rows in one contiguous buffer and
+implements ``@`` against vectors, matrices and whole ``VectorArray`` batches:
+through NumPy when it is installed, otherwise through a cache-blocked loop
+that reuses each block of columns for every row while it is still hot::
+
+    >>> from class_Vector import Vector
+    >>> m = Matrix([[1, 2], [3, 4], [5, 6]])
+    >>> m
+    Matrix([[1.0, 2.0], [3.0, 4.0], [5.0, 6.0]])
+    >>> m.shape, m[1], m[2, 0]
+    ((3, 2), Vector([3.0, 4.0]), 5.0)
+    >>> m.transpose()
+    Matrix([[1.0, 3.0, 5.0], [2.0, 4.0, 6.0]])
+    >>> Matrix(VectorArray([[300, 0], [0, 300]], typecode='h')) @ Matrix([[300, 0], [0, 1]])
+    Matrix([[90000.0, 0.0], [0.0, 300.0]])
+
+
+Matrix @ vector, vector @ matrix, and matrix @ matrix. Vectors come back as
+``Vector2``, so they support the arithmetic operators::
+
+    >>> m @ Vector([1, 1])
+    Vector([3.0, 7.0, 11.0])
+    >>> Vector2([1, 0, -1]) @ m
+    Vector([-4.0, -4.0])
+    >>> (m @ [1, 1]) * 2
+    Vector([6.0, 14.0, 22.0])
+    >>> m @ Matrix([[1, 0, 2], [0, 1, 2]])
+    Matrix([[1.0, 2.0, 6.0], [3.0, 4.0, 14.0], [5.0, 6.0, 22.0]])
+    >>> m @ Matrix.identity(2) == m
+    True
+    >>> m @ m
+    Traceback (most recent call last):
+      ...
+    ValueError: shapes (3, 2) and (3, 2) not aligned
+    >>> m @ 'AB'
+    Traceback (most recent call last):
+      ...
+    TypeError: unsupported operand type(s) for @: 'Matrix' and 'str'
+
+
+``Matrix @ VectorArray`` applies the matrix to every vector of the batch at
+once; the results come back as a ``VectorArray``::
+
+    >>> batch = VectorArray([[1, 1], [1, 0], [0, 2]])
+    >>> m @ batch
+    VectorArray([[3.0, 7.0, 11.0], [1.0, 3.0, 5.0], [4.0, 8.0, 12.0]], dim=3)
+    >>> (m @ batch)[2] == m @ batch[2]
+    True
+    >>> batch @ Matrix([[1, 0], [0, -1]])  # the batch as a stack of row vectors
+    VectorArray([[1.0, -1.0], [1.0, 0.0], [0.0, -2.0]], dim=2)
+"""
+
+from array import array
+import itertools
+import numbers
+import operator
+import reprlib
+
+from class_VectorArray import VectorArray
+from operator_overloading import Vector2
+
+BLOCK_SIZE = 64  # columns of the right operand reused for every row of the left one
+
+
+def _flat(result):
+    """A flat array('d') of a product: an array already, or a NumPy array"""
+    if isinstance(result, array):
+        return result
+    return array('d', result.astype('d').tobytes())
+
+
+def _multiply(a, b):
+    """The product of two VectorArrays taken as matrices, as a flat array"""
+    if len(b) != a.dim:
+        raise ValueError('shapes ({}, {}) and ({}, {}) not aligned'.format(
+            len(a), a.dim, len(b), b.dim))
+    if a._rows is not None:
+        return _flat(a._rows @ b._rows)
+    n, p = len(a), b.dim
+    columns = [array('d', column) for column in zip(*map(b._row, range(len(b))))]
+    out = array('d', [0.0]) * (n * p)
+    for start in range(0, p, BLOCK_SIZE):
+        block = columns[start:start + BLOCK_SIZE]
+        for i in range(n):
+            row = a._row(i)
+            offset = i * p + start
+            out[offset:offset + len(block)] = array(
+                'd', [sum(map(operator.mul, row, column)) for column in block])
+    return out
+
+
+class Matrix:
+    def __init__(self, rows):
+        if isinstance(rows, VectorArray) and rows.typecode != 'd':
+            # products of 'h' or 'f' rows would overflow or round: work in doubles
+            rows = VectorArray(rows, rows.dim)
+        self._array = rows if isinstance(rows, VectorArray) else VectorArray(rows)
+
+    @classmethod
+    def _fromflat(cls, flat, ncols):
+        return cls(VectorArray.frombuffer(flat, ncols))
+
+    @classmethod
+    def identity(cls, n):
+        flat = array('d', [0.0]) * (n * n)
+        flat[::n + 1] = array('d', [1]) * n
+        return cls._fromflat(flat, n)
+
+    @property
+    def shape(self):
+        return len(self._array), self._array.dim
+
+    def __len__(self):
+        return len(self._array)
+
+    def __iter__(self):
+        return iter(self._array)
+
+    def __getitem__(self, index):
+        if isinstance(index, tuple):
+            i, j = index
+            return self._array[i][j]
+        elif isinstance(index, numbers.Integral):
+            return self._array[index]
+        else:
+            msg = '{.__name__} indices must be integers or (row, column) pairs'
+            raise TypeError(msg.format(type(self)))
+
+    def __repr__(self):
+        va = self._array
+        rows = (va._row(i).tolist() for i in range(min(len(va), 7)))
+        return '{}({})'.format(type(self).__name__, reprlib.repr(list(rows)))
+
+    def __eq__(self, other):
+        if isinstance(other, Matrix):
+            return self.shape == other.shape and self._array._memv == other._array._memv
+        return NotImplemented
+
+    def transpose(self):
+        va = self._array
+        if va._rows is not None:
+            return self._fromflat(_flat(va._rows.T.copy()), len(va))
+        columns = zip(*map(va._row, range(len(va))))
+        return self._fromflat(array('d', itertools.chain.from_iterable(columns)), len(va))
+
+    def __matmul__(self, other):
+        va = self._array
+        if isinstance(other, Matrix):
+            return self._fromflat(_multiply(va, other._array), other._array.dim)
+        elif isinstance(other, VectorArray):
+            # every vector v of the batch becomes self @ v: the rows of other @ self.T
+            return VectorArray.frombuffer(_multiply(other, self.transpose()._array), len(va))
+        try:
+            vector = array('d', other)
+        except TypeError:
+            return NotImplemented
+        if len(vector) != va.dim:
+            raise ValueError('shapes ({}, {}) and ({},) not aligned'.format(
+                len(va), va.dim, len(vector)))
+        return Vector2._frombuffer(_flat(va @ vector))
+
+    def __rmatmul__(self, other):
+        """vector @ matrix, or VectorArray @ matrix as a stack of row vectors"""
+        if isinstance(other, VectorArray):
+            return VectorArray.frombuffer(_multiply(other, self._array), self._array.dim)
+        try:
+            return self.transpose() @ other
+        except ValueError:
+            raise ValueError('shapes ({},) and ({}, {}) not aligned'.format(
+                len(other), *self.shape)) from None
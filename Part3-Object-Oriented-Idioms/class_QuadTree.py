@@ -0,0 +1,260 @@
+"""
+A bucketed quadtree over 2-D points such as ``Vector2d``
+
+A linear scan tests every point for every query. A ``QuadTree`` splits its
+bounding box into four quadrants, recursively, until each leaf holds at most
+``leaf_size`` points; queries then skip every quadrant that cannot hold a
+match. Same interface as ``KDTree``, plus ``remove`` and rectangle queries:
+
+    >>> from class_Vector2d import Vector2d
+    >>> points = [Vector2d(x, y) for x in range(10) for y in range(10)]
+    >>> tree = QuadTree(points, leaf_size=4)
+    >>> tree
+    QuadTree(size=100)
+    >>> sorted(tree.rectangle((2, 3), (3, 4)), key=tuple)
+    [Vector2d(2.0, 3.0), Vector2d(2.0, 4.0), Vector2d(3.0, 3.0), Vector2d(3.0, 4.0)]
+    >>> sorted(tree.radius((0, 0), 1.5), key=tuple)
+    [Vector2d(0.0, 0.0), Vector2d(0.0, 1.0), Vector2d(1.0, 0.0), Vector2d(1.0, 1.0)]
+    >>> for distance, point in tree.knn((2.2, 3.1), 3):
+    ...     print('{:.4f} {}'.format(distance, point))
+    0.2236 (2.0, 3.0)
+    0.8062 (3.0, 3.0)
+    0.9220 (2.0, 4.0)
+
+
+The stored objects themselves come back::
+
+    >>> tree.knn((9, 9), 1)[0][1] is points[-1]
+    True
+
+
+Inserts outside the bounding box grow the tree; removes drop a point equal
+to the argument, and merge quadrants that became small enough::
+
+    >>> tree.insert(Vector2d(-20, 30.5))
+    >>> len(tree), tree.knn((-19, 30), 1)[0][1]
+    (101, Vector2d(-20.0, 30.5))
+    >>> for point in points[:50]:
+    ...     tree.remove(point)
+    >>> len(tree), len(list(tree))
+    (51, 51)
+    >>> tree.rectangle((0, 0), (4.5, 9))
+    []
+    >>> tree.remove(Vector2d(100, 0))
+    Traceback (most recent call last):
+      ...
+    ValueError: Vector2d(100.0, 0.0) not in QuadTree
+    >>> tree.remove(Vector2d(0, 0))
+    Traceback (most recent call last):
+      ...
+    ValueError: Vector2d(0.0, 0.0) not in QuadTree
+    >>> tree.insert((float('inf'), 0))
+    Traceback (most recent call last):
+      ...
+    ValueError: coordinates must be finite, got (inf, 0)
+    >>> QuadTree().knn((0, 0), 3)
+    []
+"""
+
+import heapq
+import itertools
+import math
+
+
+class _Quad:
+    """A node over the box (x0, y0)-(x1, y1). A leaf holds ``points``, a list
+    of (x, y, stored object) entries; an inner node holds four ``children``
+    (SW, SE, NW, NE), split at (mx, my). Boxes are half-open, x0 <= x < x1:
+    a point on an edge belongs to exactly one of the boxes sharing it"""
+    __slots__ = ('x0', 'y0', 'x1', 'y1', 'mx', 'my', 'points', 'children')
+
+    def __init__(self, x0, y0, x1, y1, points=None):
+        self.x0, self.y0, self.x1, self.y1 = x0, y0, x1, y1
+        self.points = [] if points is None else points
+        self.children = None
+
+    def contains(self, x, y):
+        return self.x0 <= x < self.x1 and self.y0 <= y < self.y1
+
+    def quadrant(self, x, y):
+        return (x >= self.mx) + 2 * (y >= self.my)
+
+    def split(self, mx=None, my=None):
+        """Turn this leaf into an inner node, with four empty children"""
+        self.mx = (self.x0 + self.x1) / 2 if mx is None else mx
+        self.my = (self.y0 + self.y1) / 2 if my is None else my
+        self.children = [_Quad(self.x0, self.y0, self.mx, self.my),
+                         _Quad(self.mx, self.y0, self.x1, self.my),
+                         _Quad(self.x0, self.my, self.mx, self.y1),
+                         _Quad(self.mx, self.my, self.x1, self.y1)]
+        entries, self.points = self.points, None
+        return entries
+
+    def distance(self, x, y):
+        """Distance from (x, y) to the closest point of the box"""
+        return math.hypot(max(self.x0 - x, 0, x - self.x1), max(self.y0 - y, 0, y - self.y1))
+
+    def entries(self):
+        """Every entry under this node"""
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node.children is None:
+                yield from node.points
+            else:
+                stack.extend(node.children)
+
+
+class QuadTree:
+    def __init__(self, points=(), leaf_size=32, max_depth=24):
+        self.leaf_size = leaf_size
+        self.max_depth = max_depth  # deeper leaves just grow: duplicates cannot be split
+        entries = [self._entry(point) for point in points]
+        self._size = len(entries)
+        self._root = None
+        if entries:
+            x0, x1 = min(e[0] for e in entries), max(e[0] for e in entries)
+            y0, y1 = min(e[1] for e in entries), max(e[1] for e in entries)
+            # nextafter: the half-open box must contain the largest coordinates too
+            x1, y1 = math.nextafter(x1, math.inf), math.nextafter(y1, math.inf)
+            self._root = _Quad(x0, y0, max(x1, x0 + 1), max(y1, y0 + 1))
+            self._load(self._root, entries, 0)
+
+    @staticmethod
+    def _entry(point):
+        x, y = point
+        x, y = float(x), float(y)
+        # no box holds an infinite coordinate, and NaN compares false with any bound
+        if not (math.isfinite(x) and math.isfinite(y)):
+            raise ValueError('coordinates must be finite, got {!r}'.format(point))
+        return x, y, point
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        if self._root is not None:
+            return (point for _, _, point in self._root.entries())
+        return iter(())
+
+    def __repr__(self):
+        return '{}(size={})'.format(type(self).__name__, self._size)
+
+    def _load(self, node, entries, depth):
+        """Bulk load: partition the entries among the quadrants, top-down"""
+        if len(entries) <= self.leaf_size or depth >= self.max_depth:
+            node.points = entries
+            return
+        node.split()
+        parts = [[], [], [], []]
+        quadrant = node.quadrant
+        for entry in entries:
+            parts[quadrant(entry[0], entry[1])].append(entry)
+        for child, part in zip(node.children, parts):
+            self._load(child, part, depth + 1)
+
+    def _grow(self, x, y):
+        """Double the root box towards (x, y): the old root becomes a quadrant"""
+        old = self._root
+        width, height = old.x1 - old.x0, old.y1 - old.y0
+        x0, x1 = (old.x0 - width, old.x1) if x < old.x0 else (old.x0, old.x1 + width)
+        y0, y1 = (old.y0 - height, old.y1) if y < old.y0 else (old.y0, old.y1 + height)
+        root = _Quad(x0, y0, x1, y1)
+        # split exactly on the old root's edges, so that it fits one quadrant
+        root.split(old.x0 if x < old.x0 else old.x1, old.y0 if y < old.y0 else old.y1)
+        root.children[root.quadrant((old.x0 + old.x1) / 2, (old.y0 + old.y1) / 2)] = old
+        self._root = root
+
+    def insert(self, point):
+        entry = self._entry(point)
+        x, y = entry[0], entry[1]
+        if self._root is None:
+            self._root = _Quad(x - .5, y - .5, x + .5, y + .5)
+        while not self._root.contains(x, y):
+            self._grow(x, y)
+        node, depth = self._root, 0
+        while node.children is not None:
+            node, depth = node.children[node.quadrant(x, y)], depth + 1
+        node.points.append(entry)
+        self._size += 1
+        # split the overfull leaf; if all its entries land in one quadrant, again
+        while len(node.points) > self.leaf_size and depth < self.max_depth:
+            for entry in node.split():
+                node.children[node.quadrant(entry[0], entry[1])].points.append(entry)
+            node, depth = node.children[node.quadrant(x, y)], depth + 1
+
+    def remove(self, point):
+        """Remove one stored point equal to ``point``; ValueError if there is none"""
+        x, y, _ = self._entry(point)
+        path, node = [], self._root
+        if node is None or not node.contains(x, y):
+            raise ValueError('{!r} not in {}'.format(point, type(self).__name__))
+        while node.children is not None:
+            path.append(node)
+            node = node.children[node.quadrant(x, y)]
+        for i, entry in enumerate(node.points):
+            if entry[2] is point or entry[2] == point:  # identity first: cheap
+                del node.points[i]
+                break
+        else:
+            raise ValueError('{!r} not in {}'.format(point, type(self).__name__))
+        self._size -= 1
+        # merge the quadrants back into one leaf, bottom-up, while they fit
+        for parent in reversed(path):
+            children = parent.children
+            if (any(child.children is not None for child in children) or
+                    sum(len(child.points) for child in children) > self.leaf_size):
+                break
+            parent.points = [entry for child in children for entry in child.points]
+            parent.children = None
+
+    def rectangle(self, lower, upper):
+        """All stored points inside the box with corners lower and upper"""
+        (lx, ly), (ux, uy) = lower, upper
+        found, stack = [], [self._root] if self._root is not None else []
+        while stack:
+            node = stack.pop()
+            if node.x0 > ux or node.x1 < lx or node.y0 > uy or node.y1 < ly:
+                continue
+            if lx <= node.x0 and node.x1 <= ux and ly <= node.y0 and node.y1 <= uy:
+                found.extend(point for _, _, point in node.entries())  # no tests needed
+            elif node.children is None:
+                found.extend(point for x, y, point in node.points
+                             if lx <= x <= ux and ly <= y <= uy)
+            else:
+                stack.extend(node.children)
+        return found
+
+    def radius(self, center, r):
+        """All stored points at distance <= r from center"""
+        cx, cy = center
+        found, stack = [], [self._root] if self._root is not None else []
+        while stack:
+            node = stack.pop()
+            if node.distance(cx, cy) > r:
+                continue
+            if node.children is None:
+                found.extend(point for x, y, point in node.points
+                             if math.hypot(x - cx, y - cy) <= r)
+            else:
+                stack.extend(node.children)
+        return found
+
+    def knn(self, query, k):
+        """The k stored points closest to query, as (distance, point) pairs, nearest first"""
+        qx, qy = query
+        found = []
+        counter = itertools.count()  # tiebreaker: nodes and points do not compare
+        # best-first: nodes by distance to their box, points by their own distance
+        heap = [(0.0, next(counter), self._root, None)] if self._root is not None else []
+        while heap and len(found) < k:
+            distance, _, node, point = heapq.heappop(heap)
+            if node is None:
+                found.append((distance, point))
+            elif node.children is None:
+                for x, y, point in node.points:
+                    heapq.heappush(heap, (math.hypot(x - qx, y - qy), next(counter), None, point))
+            else:
+                for child in node.children:
+                    heapq.heappush(heap, (child.distance(qx, qy), next(counter), child, None))
+        return found
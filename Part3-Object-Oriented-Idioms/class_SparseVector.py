@@ -0,0 +1,308 @@
+"""
+A sparse ``Vector``: only the non-zero components are stored
+
+A 10000-dimensional vector with 3 non-zero components costs 3 indices and
+3 values, kept sorted in two compact parallel arrays. ``abs``, ``hash``,
+``@``, ``==`` between sparse vectors and the arithmetic operators run in
+O(nnz), the number of non-zero components.
+
+A ``SparseVector`` is built from a dense iterable, or from a mapping of
+index -> value plus the dimension::
+
+    >>> sv = SparseVector([0, 0, 3, 0, 4, 0])
+    >>> sv
+    SparseVector({2: 3.0, 4: 4.0}, 6)
+    >>> sv == eval(repr(sv))
+    True
+    >>> big = SparseVector({10: 1, 99999: -2}, 10**5)
+    >>> len(big), big[99999], big[5], big[-1]
+    (100000, -2.0, 0.0, -2.0)
+    >>> SparseVector({6: 1}, 6)
+    Traceback (most recent call last):
+      ...
+    ValueError: index 6 out of range for dimension 6
+
+
+Same sequence protocol as ``Vector``::
+
+    >>> print(sv)
+    (0.0, 0.0, 3.0, 0.0, 4.0, 0.0)
+    >>> sv[1:5]
+    SparseVector({1: 3.0, 3: 4.0}, 4)
+    >>> sv.z, sv.t
+    (3.0, 0.0)
+
+
+Hashing and ``==`` agree with dense vectors, since hash(0.0) == 0::
+
+    >>> dense = Vector([0, 0, 3, 0, 4, 0])
+    >>> sv == dense, dense == sv, hash(sv) == hash(dense)
+    (True, True, True)
+    >>> abs(sv), bool(sv), bool(SparseVector([0, 0]))
+    (5.0, True, False)
+    >>> format(sv, '.1f')
+    '(0.0, 0.0, 3.0, 0.0, 4.0, 0.0)'
+    >>> format(SparseVector([0, 1, 0, 0]), '0.5fh')
+    '<1.00000, 1.57080, 0.00000, 0.00000>'
+
+
+``bytes()`` and ``.frombytes()`` use a sparse layout, tagged with ``'S'``::
+
+    >>> octets = bytes(big)
+    >>> len(octets) < len(bytes(Vector(big))) // 1000
+    True
+    >>> SparseVector.frombytes(octets) == big
+    True
+
+
+Arithmetic between sparse vectors stays sparse::
+
+    >>> sv + SparseVector({0: 1, 2: -3}, 3)
+    SparseVector({0: 1.0, 4: 4.0}, 6)
+    >>> -sv, sv * 2
+    (SparseVector({2: -3.0, 4: -4.0}, 6), SparseVector({2: 6.0, 4: 8.0}, 6))
+    >>> sv @ SparseVector({4: 10, 5: 1}, 6)
+    40.0
+    >>> tiny = SparseVector([1e-200, 1]) * 1e-200  # the first product underflows
+    >>> tiny, tiny == SparseVector([0.0, 1e-200])
+    (SparseVector({1: 1e-200}, 2), True)
+    >>> counts = SparseVector({1: 2}, 4, typecode='h')
+    >>> (counts + counts).typecode, (counts + sv).typecode, (counts * 0.5).typecode
+    ('h', 'd', 'd')
+    >>> counts + SparseVector({2: 3}, 4, typecode='h')
+    SparseVector({1: 2, 2: 3}, 4)
+
+
+Mixed operations dispatch to the sparse side, even with the dense operand on
+the left: Python tries the reflected method of the right operand FIRST when
+its type is a subclass of the left operand's type::
+
+    >>> v2 = Vector2([1, 1, 1, 1, 1, 1])
+    >>> v2 @ sv, sv @ v2
+    (7.0, 7.0)
+    >>> v2 + sv
+    Vector([1.0, 1.0, 4.0, 1.0, 5.0, ...])
+    >>> print(sv + (1, 2))
+    (1.0, 2.0, 3.0, 0.0, 4.0, 0.0)
+    >>> sv + 'AB'
+    Traceback (most recent call last):
+      ...
+    TypeError: unsupported operand type(s) for +: 'SparseVector' and 'str'
+"""
+
+from array import array
+import bisect
+import functools
+from collections import abc
+import itertools
+import math
+import numbers
+import operator
+import reprlib
+
+from class_Vector import Vector, promote, promote_scalar
+from operator_overloading import Vector2
+
+
+class SparseVector(Vector2):
+    __slots__ = ('_indices', '_values', '_dim')
+
+    index_typecode = 'I'
+
+    def __init__(self, components=(), dim=None, typecode=None):
+        if isinstance(components, abc.Mapping):
+            items = sorted(components.items())
+            if dim is None:
+                dim = items[-1][0] + 1 if items else 0
+        else:
+            items = list(enumerate(components))
+            dim = len(items) if dim is None else dim
+        indices, values = array(self.index_typecode), array(typecode or type(self).typecode)
+        for index, value in items:
+            if not 0 <= index < dim:
+                msg = 'index {} out of range for dimension {}'
+                raise ValueError(msg.format(index, dim))
+            if value:
+                indices.append(index)
+                values.append(value)
+        self._setup(indices, values, dim)
+
+    def _setup(self, indices, values, dim):
+        self._indices = indices
+        self._values = values
+        self._dim = dim
+
+    @classmethod
+    def _fromarrays(cls, indices, values, dim):
+        """Build a SparseVector over sorted indices and non-zero values, as is"""
+        vector = cls.__new__(cls)
+        vector._setup(indices, values, dim)
+        return vector
+
+    def _storage_typecode(self):
+        values = self._values
+        return values.typecode if isinstance(values, array) else values.format
+
+    def _cache(self, name, value):
+        if isinstance(self._values, array) or self._values.readonly:
+            super(Vector, self).__setattr__(name, value)
+        return value
+
+    def __len__(self):
+        return self._dim
+
+    def __iter__(self):
+        """Dense iteration: the zeros come back"""
+        position = 0
+        for index, value in zip(self._indices, self._values):
+            yield from itertools.repeat(0.0, index - position)
+            yield value
+            position = index + 1
+        yield from itertools.repeat(0.0, self._dim - position)
+
+    def __repr__(self):
+        items = itertools.islice(zip(self._indices, self._values), 5)
+        return '{}({}, {})'.format(type(self).__name__, reprlib.repr(dict(items)), self._dim)
+
+    def __bytes__(self):
+        header = array(self.index_typecode, [self._dim, len(self._values)])
+        return b''.join((b'S', self.typecode.encode(), memoryview(header),
+                         memoryview(self._indices), memoryview(self._values)))
+
+    def __reduce_ex__(self, protocol):
+        # the sparse layout is compact already; there is no dense buffer to share
+        return type(self).frombytes, (bytes(self),)
+
+    def __buffer__(self, flags):
+        raise TypeError('{.__name__} has no dense buffer'.format(type(self)))
+
+    @classmethod
+    def frombytes(cls, octets, copy=True):
+        memv = memoryview(octets)
+        if memv[0] != ord('S'):
+            raise ValueError('not the bytes of a {.__name__}'.format(cls))
+        typecode = chr(memv[1])
+        header_end = 2 + 2 * array(cls.index_typecode).itemsize
+        dim, nnz = memv[2:header_end].cast(cls.index_typecode)
+        indices_end = header_end + nnz * array(cls.index_typecode).itemsize
+        indices = memv[header_end:indices_end].cast(cls.index_typecode)
+        values = memv[indices_end:].cast(typecode)
+        if copy:
+            indices, values = array(cls.index_typecode, indices), array(typecode, values)
+        return cls._fromarrays(indices, values, dim)
+
+    def __eq__(self, other):
+        if isinstance(other, SparseVector):
+            return (self._dim == other._dim and self._indices == other._indices and
+                    self._values == other._values)
+        elif isinstance(other, Vector):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        else:
+            return NotImplemented
+
+    def __hash__(self):
+        """XOR of the hashes of the non-zero components only: hash(0.0) == 0"""
+        try:
+            return self._hash
+        except AttributeError:
+            hashes = map(hash, self._values)
+            return self._cache('_hash', functools.reduce(operator.xor, hashes, 0))
+
+    def __abs__(self):
+        try:
+            return self._abs
+        except AttributeError:
+            return self._cache('_abs', math.sqrt(sum(x * x for x in self._values)))
+
+    def __getitem__(self, index):
+        cls = type(self)
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._dim)
+            if step != 1:
+                return cls(self[i] for i in range(start, stop, step))
+            stop = max(start, stop)
+            lo = bisect.bisect_left(self._indices, start)
+            hi = bisect.bisect_left(self._indices, stop)
+            indices = array(self.index_typecode, (i - start for i in self._indices[lo:hi]))
+            return cls._fromarrays(indices, self._values[lo:hi], stop - start)
+        elif isinstance(index, numbers.Integral):
+            if index < 0:
+                index += self._dim
+            if not 0 <= index < self._dim:
+                raise IndexError('{.__name__} index out of range'.format(cls))
+            pos = bisect.bisect_left(self._indices, index)
+            if pos < len(self._indices) and self._indices[pos] == index:
+                return self._values[pos]
+            return 0.0
+        else:
+            msg = '{cls.__name__} indices must be integers'
+            raise TypeError(msg.format(cls=cls))
+
+    def angles(self):
+        """The angles need all d components anyway: compute them over a dense copy"""
+        try:
+            return iter(self._angles)
+        except AttributeError:
+            return iter(self._cache('_angles', tuple(Vector(self).angles())))
+
+    def __neg__(self):
+        return self._fromarrays(self._indices, array(self.typecode, (-x for x in self._values)),
+                                self._dim)
+
+    def __pos__(self):
+        return self._fromarrays(self._indices, self._values, self._dim)
+
+    def __add__(self, other):
+        if isinstance(other, SparseVector):
+            totals = dict(zip(self._indices, self._values))
+            for index, value in zip(other._indices, other._values):
+                totals[index] = totals.get(index, 0) + value  # 0: integers stay integers
+            return SparseVector(totals, max(self._dim, other._dim),
+                                promote(self.typecode, other.typecode))
+        if getattr(other, '_lazy', False):
+            return NotImplemented  # let a LazyVector build the expression, in __radd__
+        try:
+            dense = array(promote(self.typecode, getattr(other, 'typecode', 'd')), other)
+        except TypeError:
+            return NotImplemented
+        if len(dense) < self._dim:  # like Vector2: the shorter operand is filled with 0
+            dense.extend(itertools.repeat(0, self._dim - len(dense)))
+        for index, value in zip(self._indices, self._values):
+            dense[index] += value
+        return Vector2._frombuffer(dense)
+
+    def __radd__(self, other):
+        return self + other
+
+    def __mul__(self, scalar):
+        if isinstance(scalar, numbers.Real):
+            if not scalar:
+                return SparseVector((), self._dim, self.typecode)
+            typecode = promote_scalar(self.typecode, scalar)
+            values = array(typecode, (x * scalar for x in self._values))
+            if all(values):
+                return self._fromarrays(self._indices, values, self._dim)
+            # tiny products can underflow to 0.0, and zeros are never stored
+            kept = [i for i, value in enumerate(values) if value]
+            return self._fromarrays(array(self.index_typecode, (self._indices[i] for i in kept)),
+                                    array(typecode, (values[i] for i in kept)), self._dim)
+        else:
+            return NotImplemented
+
+    def __matmul__(self, other):
+        """Only the non-zero components count, like zip, the shorter operand wins"""
+        if isinstance(other, SparseVector):
+            if len(other._values) < len(self._values):
+                self, other = other, self
+            return sum(x * other[i] for i, x in zip(self._indices, self._values)
+                       if i < other._dim)
+        try:
+            if not isinstance(other, (Vector, abc.Sequence)):
+                other = array(self.typecode, other)
+            size = len(other)
+            return sum(x * other[i] for i, x in zip(self._indices, self._values) if i < size)
+        except TypeError:
+            return NotImplemented
+
+    def __rmatmul__(self, other):
+        return self @ other
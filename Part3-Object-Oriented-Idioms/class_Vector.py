@@ -42,6 +42,94 @@ Test of ``.frombytes()`` class method:
     True
 
 
+Zero-copy ``.frombytes()``: with ``copy=False`` the Vector is a view over the
+caller's buffer, read-only when that buffer is read-only::
+
+    >>> buf = bytearray(bytes(v1))
+    >>> v1_view = Vector.frombytes(buf, copy=False)
+    >>> v1_view
+    Vector([3.0, 4.0])
+    >>> buf[1:9] = bytes(array('d', [5]))
+    >>> v1_view
+    Vector([5.0, 4.0])
+    >>> Vector.frombytes(bytes(v1), copy=False)._components.readonly
+    True
+
+
+Buffer protocol export, used by ``memoryview(v)`` on Python 3.12+::
+
+    >>> memv = v1.__buffer__(0)
+    >>> memv.tolist(), memv.readonly
+    ([3.0, 4.0], True)
+
+
+Pickling: with protocol 5 the components travel as an out-of-band buffer,
+which the unpickled Vector shares instead of copying::
+
+    >>> import pickle
+    >>> v1000 = Vector(range(1000))
+    >>> buffers = []
+    >>> data = pickle.dumps(v1000, protocol=5, buffer_callback=buffers.append)
+    >>> len(buffers), len(data) < 100
+    (1, True)
+    >>> pickle.loads(data, buffers=buffers) == v1000
+    True
+    >>> all(pickle.loads(pickle.dumps(v1000, protocol=p)) == v1000 for p in range(6))
+    True
+
+
+Typecodes: ``'d'`` by default, selectable per instance or per subclass.
+``bytes()`` and ``.frombytes()`` round-trip the typecode, and so do slicing,
+copying and pickling::
+
+    >>> vf = Vector([1/4, 3], typecode='f')
+    >>> vf, vf.typecode, len(bytes(vf))
+    (Vector([0.25, 3.0], typecode='f'), 'f', 9)
+    >>> Vector.frombytes(bytes(vf)).typecode
+    'f'
+    >>> import copy
+    >>> vh = Vector([1, 2, 3], typecode='h')
+    >>> vh[:2], copy.copy(vh).typecode, copy.deepcopy(vf).typecode
+    (Vector([1, 2], typecode='h'), 'h', 'f')
+    >>> [pickle.loads(pickle.dumps(vf, protocol=p)).typecode for p in range(6)]
+    ['f', 'f', 'f', 'f', 'f', 'f']
+    >>> class ByteVector(Vector):
+    ...     __slots__ = ()
+    ...     typecode = 'b'
+    >>> bv = ByteVector([1, 2, 3])
+    >>> bv, bv.typecode, ByteVector.typecode, len(bytes(bv))
+    (Vector([1, 2, 3]), 'b', 'b', 4)
+    >>> bv == Vector([1, 2, 3]), hash(bv) == hash(Vector([1, 2, 3]))
+    (True, True)
+    >>> Vector([1.5], typecode='i')
+    Traceback (most recent call last):
+      ...
+    TypeError: 'float' object cannot be interpreted as an integer
+
+
+Streaming many vectors: ``dump_many`` writes framed blocks of vectors of
+the same typecode and dimension, ``iter_load`` reads them back lazily::
+
+    >>> import io
+    >>> vectors = [Vector([i, -i]) for i in range(1000)] + [Vector([1, 2, 3], typecode='h')]
+    >>> f = io.BytesIO()
+    >>> Vector.dump_many(vectors, f), Vector.dump_many([(1, 2), [3, 4]], f)
+    (1001, 2)
+    >>> _ = f.seek(0)
+    >>> loaded = Vector.iter_load(f)
+    >>> next(loaded), next(loaded)
+    (Vector([0.0, 0.0]), Vector([1.0, -1.0]))
+    >>> rest = list(loaded)
+    >>> rest[-3:]
+    [Vector([1, 2, 3], typecode='h'), Vector([1.0, 2.0]), Vector([3.0, 4.0])]
+    >>> vectors[2:] == rest[:-2]
+    True
+    >>> list(Vector.iter_load(io.BytesIO(f.getvalue()[:-1])))
+    Traceback (most recent call last):
+      ...
+    ValueError: truncated block: expected 32 bytes, got 31
+
+
 Tests with 3-dimensions::
 
     >>> v1 = Vector([3, 4, 5])
@@ -146,6 +234,21 @@ Most hash values of non-integers vary from a 32-bit to 64-bit CPython build::
     True
 
 
+``hash``, ``abs`` and the angles are computed once, then cached in slots::
+
+    >>> v1 = Vector([3, 4])
+    >>> hash(v1), v1._hash
+    (7, 7)
+    >>> abs(v1), v1._abs
+    (5.0, 5.0)
+    >>> hasattr(v1, '__dict__')
+    False
+    >>> v1.spam = 'eggs'
+    Traceback (most recent call last):
+      ...
+    AttributeError: 'Vector' object has no attribute 'spam'
+
+
 Tests of ``format()`` with Cartesian coordinates in 2D::
 
     >>> v1 = Vector([3, 4])
@@ -186,6 +289,26 @@ Tests of ``format()`` with spherical coordinates in 2D, 3D and 4D::
     '<4.000e+00, 1.047e+00, 9.553e-01, 7.854e-01>'
     >>> format(Vector([0, 1, 0, 0]), '0.5fh')
     '<1.00000, 1.57080, 0.00000, 0.00000>'
+
+
+``angles()`` takes one pass over suffix sums of squares, and agrees with
+``angle(n)``::
+
+    >>> v7 = Vector([3, -1, 4, 1, -5, 9, -2])
+    >>> all(math.isclose(a, v7.angle(n)) for n, a in enumerate(v7.angles(), 1))
+    True
+
+
+Tests of ``Vector.format_many()``, formatting a whole collection at once::
+
+    >>> vectors = [Vector([1, 1]), Vector([2, 2, 2]), Vector([0, 1, 0, 0])]
+    >>> for line in Vector.format_many(vectors, '.3eh'):
+    ...     print(line)
+    <1.414e+00, 7.854e-01>
+    <3.464e+00, 9.553e-01, 7.854e-01>
+    <1.000e+00, 1.571e+00, 0.000e+00, 0.000e+00>
+    >>> list(Vector.format_many(vectors[:2], '.1f'))
+    ['(1.0, 1.0)', '(2.0, 2.0, 2.0)']
 """
 
 from array import array
@@ -195,28 +318,106 @@ import numbers
 import functools
 import operator
 import itertools
+from multiprocessing import shared_memory
+import pickle
+import struct
+import weakref
+
+
+# dump_many blocks: typecode, codec byte, 2 pad bytes, dim, count, then the items.
+# With a codec (see codec_vector.py), the payload size, then the encoded items
+BLOCK_HEADER = struct.Struct('<cBxxII')
+PAYLOAD_SIZE = struct.Struct('<I')
+BLOCK_ITEMS = 2 ** 17  # components per block, about 1 MB of 'd'
+
+INTEGER_TYPECODES = 'bhilq'  # signed, narrowest first
+FLOAT_TYPECODES = 'fd'
+
+
+def promote(*typecodes):
+    """The typecode of the result of arithmetic between vectors of these typecodes.
+
+    - integers with integers: the widest of them
+    - 'b' or 'h' with 'f': 'f', which holds every 8 and 16-bit integer exactly
+    - any other mix of integers and floats, or anything with 'd': 'd'
+    """
+    if all(tc in INTEGER_TYPECODES for tc in typecodes):
+        return max(typecodes, key=INTEGER_TYPECODES.index)
+    if all(tc in 'bhf' for tc in typecodes):
+        return 'f'
+    return 'd'
+
+
+def promote_scalar(typecode, scalar):
+    """The typecode of the result of vector * scalar: integral scalars keep the
+    typecode, any other real turns integer typecodes into 'd'"""
+    if isinstance(scalar, numbers.Integral) or typecode in FLOAT_TYPECODES:
+        return typecode
+    return 'd'
+
+
+class _Typecode:
+    """The ``typecode`` attribute: read on a class, it is the default typecode
+    of its instances; read on an instance, it is the typecode of its storage"""
+
+    def __init__(self, default):
+        self.default = default
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self.default
+        try:
+            return instance._storage_typecode()
+        except AttributeError:  # no storage yet: in the middle of __init__
+            return self.default
 
 
 class Vector:
-    typecode = 'd'
+    # Vectors are immutable, so hash, abs and angles are computed once and cached.
+    # __slots__ keeps the cache from bringing back a per-instance __dict__
+    __slots__ = ('_components', '_hash', '_abs', '_angles')
+
+    typecode = _Typecode('d')
+    parallel_threshold = 2 ** 22  # from this many components on, reduce in a process pool
+
+    def __init_subclass__(cls, **kwargs):
+        """Subclasses may pick their default typecode with a plain class attribute"""
+        super().__init_subclass__(**kwargs)
+        if isinstance(cls.__dict__.get('typecode'), str):
+            cls.typecode = _Typecode(cls.__dict__['typecode'])
 
-    def __init__(self, components):
-        self._components = array(self.typecode, components)
+    def __init__(self, components, typecode=None):
+        self._components = array(typecode or type(self).typecode, components)
+
+    def _storage_typecode(self):
+        components = self._components
+        return components.typecode if isinstance(components, array) else components.format
 
     def __iter__(self):
         return iter(self._components)
 
     def __repr__(self):
-        components = reprlib.repr(self._components)
+        # islice keeps repr cheap and works for views (memoryview) as well as arrays
+        components = reprlib.repr(array(self.typecode, itertools.islice(self._components, 6)))
         components = components[components.find('['):-1]
+        if self.typecode != type(self).typecode:
+            return 'Vector({}, typecode={!r})'.format(components, self.typecode)
         return 'Vector({})'.format(components)
 
     def __str__(self):
         return str(tuple(self))
 
     def __bytes__(self):
-        return (bytes([ord(self.typecode)]) +
-                bytes(self._components))
+        # join reads the storage through the buffer protocol: a single copy
+        return b''.join((self.typecode.encode(), memoryview(self._components)))
+
+    def __buffer__(self, flags):
+        """Export the storage without copying: ``memoryview(v)`` (Python >= 3.12).
+        The export is read-only, since Vectors are immutable"""
+        return memoryview(self._components).toreadonly()
+
+    def __release_buffer__(self, view):
+        view.release()
 
     def __eq__(self, other):
         """__ne__ falls back to calling __eq__, with the result negated"""
@@ -228,11 +429,27 @@ class Vector:
 
     def __hash__(self):
         """good practice to provide 3rd arg for reduce"""
-        hashes = (hash(x) for x in self)
-        return functools.reduce(operator.xor, hashes, 0)
+        try:
+            return self._hash
+        except AttributeError:  # empty slot: first call
+            hashes = (hash(x) for x in self)
+            return self._cache('_hash', functools.reduce(operator.xor, hashes, 0))
 
     def __abs__(self):
-        return math.sqrt(sum(x * x for x in self))
+        try:
+            return self._abs
+        except AttributeError:
+            if len(self) >= self.parallel_threshold:
+                import parallel_reduce  # only huge vectors pay for the import
+                return self._cache('_abs', math.sqrt(parallel_reduce.sum_of_squares(self._components)))
+            return self._cache('_abs', math.sqrt(sum(x * x for x in self)))
+
+    def _cache(self, name, value):
+        """Store value in the ``name`` slot and return it. Views over writable
+        buffers can change under our feet, so their values are never cached"""
+        if isinstance(self._components, array) or self._components.readonly:
+            super().__setattr__(name, value)
+        return value
 
     def __bool__(self):
         return bool(abs(self))
@@ -243,7 +460,7 @@ class Vector:
     def __getitem__(self, index):
         cls = type(self)
         if isinstance(index, slice):
-            return cls(self._components[index])
+            return cls(self._components[index], self.typecode)
         elif isinstance(index, numbers.Integral):
             # using ABCs in isinstance tests makes an API more flexible and future-proof
             return self._components[index]
@@ -265,8 +482,9 @@ class Vector:
         cls = type(self)
         if len(name) == 1:
             pos = cls.shortcut_names.find(name)
-            if 0 <= pos < len(self._components):
-                return self._components[pos]
+            # len(self) and self[pos] rather than _components: subclasses may store them otherwise
+            if 0 <= pos < len(self):
+                return self[pos]
         msg = '{.__name__!r} object has no attribute {!r}'
         raise AttributeError(msg.format(cls, name))
 
@@ -293,7 +511,8 @@ class Vector:
         super().__setattr__(name, value)
 
     def angle(self, n):
-        r = math.sqrt(sum(x * x for x in self[n:]))
+        # islice rather than self[n:]: no new Vector just to sum its squares
+        r = math.sqrt(sum(x * x for x in itertools.islice(self, n, None)))
         a = math.atan2(r, self[n - 1])
         if (n == len(self) - 1) and (self[-1] < 0):
             return math.pi * 2 - a
@@ -301,7 +520,18 @@ class Vector:
             return a
 
     def angles(self):
-        return (self.angle(n) for n in range(1, len(self)))
+        """All the angles in one pass: calling angle(n) for each n is O(d**2)"""
+        try:
+            return iter(self._angles)
+        except AttributeError:
+            components = self._components
+            # suffix[n] == sum of the squares of self[n:], accumulated right to left
+            suffix = list(itertools.accumulate(x * x for x in reversed(components)))
+            suffix.reverse()
+            angles = [math.atan2(math.sqrt(r2), x) for r2, x in zip(suffix[1:], components)]
+            if angles and components[-1] < 0:
+                angles[-1] = math.pi * 2 - angles[-1]
+            return iter(self._cache('_angles', tuple(angles)))
 
     def __format__(self, fmt_spec=''):
         if fmt_spec.endswith('h'):  # hyperspherical coordinates
@@ -315,8 +545,220 @@ class Vector:
         components = (format(c, fmt_spec) for c in coords)
         return outer_fmt.format(', '.join(components))
 
+    @staticmethod
+    def format_many(vectors, fmt_spec=''):
+        """Generate format(v, fmt_spec) for every v in vectors, parsing fmt_spec once"""
+        if fmt_spec.endswith('h'):
+            fmt_spec = fmt_spec[:-1]
+            outer_fmt = '<{}>'
+
+            def coords(v):
+                return itertools.chain([abs(v)], v.angles())
+        else:
+            outer_fmt = '({})'
+            coords = iter
+        specs = itertools.repeat(fmt_spec)
+        for vector in vectors:
+            # map stops at the shorter iterable: the coordinates
+            yield outer_fmt.format(', '.join(map(format, coords(vector), specs)))
+
     @classmethod
-    def frombytes(cls, octets):
+    def frombytes(cls, octets, copy=True):
+        """With ``copy=False`` the Vector is a view over the caller's buffer,
+        which must then stay unchanged for as long as the Vector is in use"""
         typecode = chr(octets[0])
-        memv = memoryview(octets[1:]).cast(typecode)
-        return cls(memv)
+        # slicing the memoryview, not the octets, avoids a copy
+        memv = memoryview(octets)[1:].cast(typecode)
+        if copy:
+            return cls(memv, typecode)
+        return cls._frombuffer(memv)
+
+    @classmethod
+    def dump_many(cls, vectors, fileobj, codec=None):
+        """Write vectors to the binary file fileobj in framed blocks of up to
+        BLOCK_ITEMS components; return how many vectors were written.
+        A block holds consecutive vectors of the same typecode and dimension.
+        ``codec`` names a compression codec from codec_vector, like 'xor+zlib'"""
+        if codec:
+            import codec_vector  # only compressed archives pay for zlib and lzma
+            codec = codec_vector.codec_id(codec)
+        total = 0
+        block, dim, count, capacity = None, None, 0, 0
+
+        def flush():
+            if not count:
+                return
+            if codec:
+                # encode before writing anything: a block that fails leaves no partial frame
+                block_codec = codec_vector.block_codec(codec, block)
+                payload = codec_vector.encode(block_codec, block, dim)
+                fileobj.write(BLOCK_HEADER.pack(block.typecode.encode(), block_codec, dim, count))
+                fileobj.write(PAYLOAD_SIZE.pack(len(payload)))
+                fileobj.write(payload)
+            else:
+                fileobj.write(BLOCK_HEADER.pack(block.typecode.encode(), 0, dim, count))
+                fileobj.write(block)
+
+        for vector in vectors:
+            if isinstance(vector, Vector):
+                try:
+                    items = memoryview(vector._components)
+                except AttributeError:  # no dense storage, like SparseVector
+                    items = memoryview(array(vector.typecode, vector))
+            else:
+                items = memoryview(array(cls.typecode, vector))
+            typecode = items.format
+            if count == capacity or typecode != block.typecode or len(items) != dim:
+                flush()
+                block, dim, count = array(typecode), len(items), 0
+                capacity = max(1, BLOCK_ITEMS // dim) if dim else BLOCK_ITEMS
+            block.frombytes(items.cast('B'))
+            count += 1
+            total += 1
+        flush()
+        return total
+
+    @classmethod
+    def iter_load(cls, fileobj, copy=True):
+        """Generate the vectors written by dump_many, reading and decoding one
+        block at a time. With ``copy=False`` they are views over their block,
+        read-only unless the block was decoded by a codec"""
+        while True:
+            header = fileobj.read(BLOCK_HEADER.size)
+            if not header:
+                return
+            if len(header) < BLOCK_HEADER.size:
+                raise ValueError('truncated block header')
+            typecode, codec, dim, count = BLOCK_HEADER.unpack(header)
+            typecode = typecode.decode()
+            nbytes = array(typecode).itemsize * dim * count
+            if codec:
+                import codec_vector
+                size = fileobj.read(PAYLOAD_SIZE.size)
+                if len(size) < PAYLOAD_SIZE.size:
+                    raise ValueError('truncated block header')
+                nbytes, = PAYLOAD_SIZE.unpack(size)
+            data = fileobj.read(nbytes)
+            if len(data) < nbytes:
+                raise ValueError('truncated block: expected {} bytes, got {}'
+                                 .format(nbytes, len(data)))
+            if codec:
+                data = codec_vector.decode(codec, data, typecode, dim)
+                if len(data) != dim * count:
+                    raise ValueError('corrupt block: expected {} items, decoded {}'
+                                     .format(dim * count, len(data)))
+            items = memoryview(data).cast(typecode) if codec == 0 else memoryview(data)
+            for i in range(count):
+                row = items[i * dim:(i + 1) * dim]
+                yield cls(row, typecode) if copy else cls._frombuffer(row)
+
+    def __reduce_ex__(self, protocol):
+        """Protocol 5: a PickleBuffer over the storage, so pickle.dumps with a
+        buffer_callback can send it out-of-band, without copying it"""
+        if protocol >= 5:
+            buffer = pickle.PickleBuffer(self._components)
+            return type(self)._fromparts, (buffer, memoryview(self._components).format)
+        components = self._components
+        if not isinstance(components, array):  # memoryviews cannot be pickled
+            components = array(components.format, components)
+        return type(self), (components, components.typecode)
+
+    @classmethod
+    def _fromparts(cls, buffer, typecode):
+        """Unpickle protocol 5: a view over the buffer, in-band or out-of-band"""
+        return cls._frombuffer(memoryview(buffer).cast('B').cast(typecode))
+
+    @classmethod
+    def _frombuffer(cls, memv):
+        """Build a Vector over ``memv`` without copying: a view, not a copy"""
+        vector = cls.__new__(cls)
+        vector._components = memv
+        return vector
+
+
+class SharedVector(Vector):
+    """
+    A Vector whose components live in ``multiprocessing.shared_memory``
+
+    Sending a Vector to a ``ProcessPoolExecutor`` worker pickles it, copying
+    every component. A SharedVector pickles as just the segment name, the
+    offset and the shape; the receiving process attaches to the same memory.
+
+        >>> sv = SharedVector([3, 4])
+        >>> sv, abs(sv)
+        (Vector([3.0, 4.0]), 5.0)
+        >>> import pickle
+        >>> clone = pickle.loads(pickle.dumps(sv))
+        >>> clone == sv, clone.name == sv.name
+        (True, True)
+        >>> from concurrent.futures import ProcessPoolExecutor
+        >>> with ProcessPoolExecutor(1) as executor:
+        ...     executor.submit(abs, sv).result()
+        5.0
+
+    Lifecycle: the process that created the segment owns it. ``close()``
+    detaches any SharedVector from the segment, and the owner's ``close()``
+    also unlinks it, so the memory goes away. Either happens at the latest
+    when the SharedVector is garbage collected. Using a closed SharedVector
+    fails loudly::
+
+        >>> clone.close()
+        >>> with sv:
+        ...     sv.x
+        3.0
+        >>> sv.x
+        Traceback (most recent call last):
+          ...
+        ValueError: operation forbidden on released memoryview object
+    """
+    __slots__ = ('_shm', '_offset', '_finalizer', '__weakref__')
+
+    def __init__(self, components, typecode=None):
+        items = array(typecode or type(self).typecode, components)
+        shm = shared_memory.SharedMemory(create=True, size=max(1, items.itemsize * len(items)))
+        shm.buf[:items.itemsize * len(items)] = memoryview(items).cast('B')
+        self._setup(shm, 0, len(items), items.typecode, owner=True)
+
+    @classmethod
+    def attach(cls, name, offset, length, typecode):
+        """A SharedVector over ``length`` items at ``offset`` bytes in segment ``name``"""
+        vector = cls.__new__(cls)
+        vector._setup(shared_memory.SharedMemory(name=name), offset, length, typecode, owner=False)
+        return vector
+
+    def _setup(self, shm, offset, length, typecode, owner):
+        memv = shm.buf[offset:offset + length * array(typecode).itemsize]
+        # read-only, like every Vector: which also lets hash, abs and angles be cached
+        self._components = memv.cast(typecode).toreadonly()
+        memv.release()
+        self._shm = shm
+        self._offset = offset
+        self._finalizer = weakref.finalize(self, _release_shared, self._components, shm, owner)
+
+    @property
+    def name(self):
+        return self._shm.name
+
+    def __reduce_ex__(self, protocol):
+        # no components in the pickle, whatever the protocol: only where to find them
+        return (type(self).attach,
+                (self._shm.name, self._offset, len(self._components), self._components.format))
+
+    def close(self):
+        self._finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def _release_shared(components, shm, owner):
+    components.release()
+    try:
+        shm.close()
+    except BufferError:
+        pass  # views exported by __buffer__ still map it: unmapped when they are gone
+    if owner:
+        shm.unlink()
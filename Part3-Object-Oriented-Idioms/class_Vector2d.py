@@ -85,6 +85,12 @@ class Vector2d:
         >>> len(set([v1, v2]))
         2
 
+    Tests of pickling:
+
+        >>> import pickle
+        >>> all(pickle.loads(pickle.dumps(v1, protocol=p)) == v1 for p in range(6))
+        True
+
     Tests of name mangling:
 
         # >>> v1.__dict__  # slots used
@@ -174,12 +180,18 @@ class Vector2d:
         # use the bitwise XOR operator ^ to mix the hashes of the components
         return hash(self.x) ^ hash(self.y)
 
+    def __reduce_ex__(self, protocol):
+        """Two floats are all there is: no buffer worth sending out-of-band,
+        and the default reduce would add a dict of slots to the pickle"""
+        return type(self), (self.__x, self.__y)
+
     @classmethod
     def frombytes(cls, octets):
         """An alternative constructor that accepts a binary sequence"""
         typecode = chr(octets[0])
-        # create a memoryview from the octets binary seq and use the typecode to cast it
-        memv = memoryview(octets[1:]).cast(typecode)
+        # create a memoryview from the octets binary seq and use the typecode to cast it,
+        # slicing the memoryview rather than the octets to avoid copying them
+        memv = memoryview(octets)[1:].cast(typecode)
         # unpack the memoryview into the pair of arguments needed for the constructor
         return cls(*memv)
 
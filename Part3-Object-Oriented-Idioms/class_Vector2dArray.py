@@ -0,0 +1,206 @@
+"""
+A compact, columnar collection of 2-D points
+
+Each ``Vector2d`` is a full Python object holding two float objects. A
+``Vector2dArray`` keeps the x and the y of N points in two contiguous arrays
+instead: 16 bytes per point with the default ``'d'`` typecode. ``abs``,
+``angle`` and polar formatting run over whole columns at once (with NumPy
+when it is installed)::
+
+    >>> points = Vector2dArray([(3, 4), (1, 1), (0, -2)])
+    >>> points
+    Vector2dArray([(3.0, 4.0), (1.0, 1.0), (0.0, -2.0)])
+    >>> len(points), points.xs, points.ys
+    (3, array('d', [3.0, 1.0, 0.0]), array('d', [4.0, 1.0, -2.0]))
+    >>> points.xs.itemsize + points.ys.itemsize
+    16
+    >>> abs(points).tolist()
+    [5.0, 1.4142135623730951, 2.0]
+    >>> print(format(points, '.3fp'))
+    [<5.000, 0.927>, <1.414, 0.785>, <2.000, -1.571>]
+    >>> print(format(points))
+    [(3.0, 4.0), (1.0, 1.0), (0.0, -2.0)]
+
+
+``Vector2d`` instances are built on demand, one per point accessed::
+
+    >>> points[0], points[-1]
+    (Vector2d(3.0, 4.0), Vector2d(0.0, -2.0))
+    >>> points[0] == Vector2d(3, 4), abs(points[0])
+    (True, 5.0)
+    >>> points[1:]
+    Vector2dArray([(1.0, 1.0), (0.0, -2.0)])
+    >>> points[3]
+    Traceback (most recent call last):
+      ...
+    IndexError: Vector2dArray index out of range
+
+
+Points are appended one by one or in bulk, from ``Vector2d`` instances or
+any pairs of numbers::
+
+    >>> points.append(Vector2d(6, 8))
+    >>> points.extend([(5, 12)])
+    >>> [format(p, '.1f') for p in points[-2:]]
+    ['(6.0, 8.0)', '(5.0, 12.0)']
+    >>> points.append((1, 2, 3))
+    Traceback (most recent call last):
+      ...
+    ValueError: expected 2 coordinates, got 3
+    >>> points.append((3, 'a'))
+    Traceback (most recent call last):
+      ...
+    TypeError: must be real number, not str
+    >>> len(points), len(points.xs), len(points.ys)
+    (5, 5, 5)
+
+
+Bulk ``bytes()`` and ``.frombytes()``: the typecode, then the x column, then
+the y column, each written with one buffer copy::
+
+    >>> octets = bytes(points)
+    >>> len(octets) == 1 + 16 * len(points)
+    True
+    >>> Vector2dArray.frombytes(octets) == points
+    True
+    >>> Vector2dArray.fromcoords([1, 2], [3, 4])
+    Vector2dArray([(1.0, 3.0), (2.0, 4.0)])
+"""
+
+from array import array
+import itertools
+import math
+import numbers
+import reprlib
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional: fall back to array + builtins
+    numpy = None
+
+from class_Vector2d import Vector2d
+
+
+class Vector2dArray:
+    typecode = 'd'
+    point_class = Vector2d
+
+    def __init__(self, points=()):
+        self.xs = array(self.typecode)
+        self.ys = array(self.typecode)
+        self.extend(points)
+
+    @classmethod
+    def fromcoords(cls, xs, ys):
+        """Build from a column of x and a column of y coordinates"""
+        points = cls()
+        points.xs.extend(xs)
+        points.ys.extend(ys)
+        if len(points.xs) != len(points.ys):
+            raise ValueError('xs and ys must have the same length')
+        return points
+
+    def append(self, point):
+        # convert both coordinates before storing either: the columns stay aligned
+        x, y = array(self.typecode, self._pair(point))
+        self.xs.append(x)
+        self.ys.append(y)
+
+    def extend(self, points):
+        if isinstance(points, Vector2dArray):
+            self.xs.extend(points.xs)
+            self.ys.extend(points.ys)
+            return
+        for point in points:
+            self.append(point)
+
+    @staticmethod
+    def _pair(point):
+        coords = tuple(point)
+        if len(coords) != 2:
+            raise ValueError('expected 2 coordinates, got {}'.format(len(coords)))
+        return coords
+
+    def __len__(self):
+        return len(self.xs)
+
+    def __iter__(self):
+        return map(self.point_class, self.xs, self.ys)
+
+    def __getitem__(self, index):
+        cls = type(self)
+        if isinstance(index, slice):
+            return cls.fromcoords(self.xs[index], self.ys[index])
+        elif isinstance(index, numbers.Integral):
+            try:
+                return self.point_class(self.xs[index], self.ys[index])
+            except IndexError:
+                raise IndexError('{.__name__} index out of range'.format(cls)) from None
+        else:
+            msg = '{.__name__} indices must be integers or slices'
+            raise TypeError(msg.format(cls))
+
+    def __repr__(self):
+        pairs = zip(self.xs[:7], self.ys[:7])
+        return '{}({})'.format(type(self).__name__, reprlib.repr(list(pairs)))
+
+    def __eq__(self, other):
+        if isinstance(other, Vector2dArray):
+            return self.xs == other.xs and self.ys == other.ys
+        return NotImplemented
+
+    def _columns(self):
+        """The columns as NumPy arrays, no copies; None without NumPy"""
+        if numpy is None:
+            return None
+        return (numpy.frombuffer(self.xs, dtype=self.xs.typecode),
+                numpy.frombuffer(self.ys, dtype=self.ys.typecode))
+
+    def __abs__(self):
+        """Magnitude of every point, in one batch"""
+        columns = self._columns()
+        if columns is not None:
+            return numpy.hypot(*columns)
+        return array('d', map(math.hypot, self.xs, self.ys))
+
+    def angle(self):
+        """Angle of every point, in one batch"""
+        columns = self._columns()
+        if columns is not None:
+            return numpy.arctan2(columns[1], columns[0])
+        return array('d', map(math.atan2, self.ys, self.xs))
+
+    def format_each(self, format_spec=''):
+        """Generate format(point, format_spec) for every point, like Vector2d.__format__"""
+        if format_spec.endswith('p'):
+            format_spec = format_spec[:-1]
+            coords = zip(abs(self), self.angle())
+            outer_format = '<{}, {}>'
+        else:
+            coords = zip(self.xs, self.ys)
+            outer_format = '({}, {})'
+        specs = itertools.repeat(format_spec)
+        for pair in coords:
+            yield outer_format.format(*map(format, pair, specs))
+
+    def __format__(self, format_spec=''):
+        return '[{}]'.format(', '.join(self.format_each(format_spec)))
+
+    def __bytes__(self):
+        return b''.join((self.xs.typecode.encode(), memoryview(self.xs), memoryview(self.ys)))
+
+    def tobytes(self):
+        return bytes(self)
+
+    @classmethod
+    def frombytes(cls, octets):
+        """An alternative constructor that accepts the output of bytes()"""
+        typecode = chr(octets[0])
+        memv = memoryview(octets)[1:].cast(typecode)
+        if len(memv) % 2:
+            raise ValueError('expected as many x as y coordinates')
+        half = len(memv) // 2
+        points = cls()
+        points.xs = array(typecode, memv[:half])
+        points.ys = array(typecode, memv[half:])
+        return points
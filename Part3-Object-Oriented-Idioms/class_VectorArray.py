@@ -0,0 +1,268 @@
+"""
+A columnar container of n-dimensional ``Vector`` instances
+
+Each ``Vector`` owns its own ``array``, so millions of them pay millions of
+object headers and run their math in per-object Python loops. A ``VectorArray``
+stores N vectors of dimension d back to back in ONE contiguous buffer and does
+the bulk math over the whole buffer (with NumPy when it is installed).
+
+A ``VectorArray`` is built from an iterable of vectors of the same dimension::
+
+    >>> va = VectorArray([[3, 4], [6, 8], [0, 0]])
+    >>> va
+    VectorArray([[3.0, 4.0], [6.0, 8.0], [0.0, 0.0]], dim=2)
+    >>> len(va), va.dim
+    (3, 2)
+    >>> VectorArray([[1, 2], [3]])
+    Traceback (most recent call last):
+      ...
+    ValueError: expected vectors of dimension 2, got 1
+
+
+Indexing hands out ``Vector`` views over the shared buffer, no copies::
+
+    >>> v = va[1]
+    >>> v
+    Vector([6.0, 8.0])
+    >>> v == Vector([6, 8]), abs(v)
+    (True, 10.0)
+    >>> va[-1]
+    Vector([0.0, 0.0])
+    >>> va[3]
+    Traceback (most recent call last):
+      ...
+    IndexError: VectorArray index out of range
+    >>> va[:2]
+    VectorArray([[3.0, 4.0], [6.0, 8.0]], dim=2)
+    >>> va['x']
+    Traceback (most recent call last):
+      ...
+    TypeError: VectorArray indices must be integers or slices
+
+
+Batched ``abs`` and ``@``: pairwise with another ``VectorArray``, or every
+row against a single vector::
+
+    >>> abs(va).tolist()
+    [5.0, 10.0, 0.0]
+    >>> vb = VectorArray([[1, 0], [0, 1], [2, 2]])
+    >>> (va @ vb).tolist()
+    [3.0, 8.0, 0.0]
+    >>> (va @ Vector([1, 1])).tolist()
+    [7.0, 14.0, 0.0]
+    >>> va.distances([3, 0]).tolist()
+    [4.0, 8.54400374531753, 3.0]
+
+
+Equality masks and hashes, matching ``==`` and ``hash()`` of each ``Vector``::
+
+    >>> [bool(m) for m in va.equal(VectorArray([[3, 4], [6, 9], [0, 0]]))]
+    [True, False, True]
+    >>> [bool(m) for m in va.equal(Vector([6, 8]))]
+    [False, True, False]
+    >>> va.hashes() == [hash(Vector(row)) for row in [[3, 4], [6, 8], [0, 0]]]
+    True
+
+
+``frombuffer`` wraps an existing buffer of ``n * dim`` items without copying::
+
+    >>> flat = array('d', [1, 2, 3, 4, 5, 6])
+    >>> VectorArray.frombuffer(flat, 3)
+    VectorArray([[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]], dim=3)
+
+
+Typed buffers keep their typecode; raw bytes are read as ``'d'``, unless
+told otherwise::
+
+    >>> shorts = VectorArray.frombuffer(array('h', range(8)), 2)
+    >>> shorts.typecode, shorts[3]
+    ('h', Vector([6, 7], typecode='h'))
+    >>> VectorArray.frombuffer(bytes(flat), 2)[0]
+    Vector([1.0, 2.0])
+    >>> VectorArray.frombuffer(bytes(array('f', [1, 2])), 2, 'f')[0]
+    Vector([1.0, 2.0], typecode='f')
+
+
+Other typecodes than ``'d'`` cut the memory per component::
+
+    >>> small = VectorArray([[1, 2], [3, 4]], typecode='h')
+    >>> small[1], small[1].typecode, abs(small).tolist()
+    (Vector([3, 4], typecode='h'), 'h', [2.23606797749979, 5.0])
+    >>> [bool(m) for m in small.equal(Vector([3, 4]))], [bool(m) for m in small.equal([1.5, 2])]
+    ([False, True], [False, False])
+
+
+Norms and dot products are computed in doubles whatever the typecode, so
+``'h'`` components cannot overflow::
+
+    >>> wide = VectorArray([[200, 200], [-300, 400]], typecode='h')
+    >>> abs(wide).tolist(), (wide @ wide).tolist()
+    ([282.842712474619, 500.0], [80000.0, 250000.0])
+"""
+
+from array import array
+import functools
+import itertools
+import math
+import numbers
+import operator
+import reprlib
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional: fall back to array + builtins
+    numpy = None
+
+from class_Vector import Vector
+
+
+NUMERIC_TYPECODES = 'bhHiIlLqQfd'  # buffer formats frombuffer takes as they are; not 'B', bytes
+
+
+class VectorArray:
+    typecode = 'd'
+
+    def __init__(self, vectors, dim=None, typecode=None):
+        self.typecode = typecode or type(self).typecode
+        flat = array(self.typecode)
+        count = 0
+        for vector in vectors:
+            # extending a flat array keeps everything in one contiguous buffer
+            before = len(flat)
+            flat.extend(vector)
+            if dim is None:
+                dim = len(flat) - before
+            elif len(flat) - before != dim:
+                msg = 'expected vectors of dimension {}, got {}'
+                raise ValueError(msg.format(dim, len(flat) - before))
+            count += 1
+        self._setup(memoryview(flat), count, dim or 0)
+
+    @classmethod
+    def frombuffer(cls, buffer, dim, typecode=None):
+        """An alternative constructor sharing the memory of ``buffer``"""
+        memv = memoryview(buffer)
+        if typecode is None:
+            typecode = memv.format if memv.format in NUMERIC_TYPECODES else cls.typecode
+        if memv.format != typecode:
+            memv = memv.cast('B').cast(typecode)
+        if dim and len(memv) % dim:
+            raise ValueError('buffer size is not a multiple of dim={}'.format(dim))
+        vectors = cls.__new__(cls)
+        vectors.typecode = typecode
+        vectors._setup(memv, len(memv) // dim if dim else 0, dim)
+        return vectors
+
+    def _setup(self, memv, count, dim):
+        self._memv = memv
+        self._count = count
+        self.dim = dim
+        if numpy is not None:
+            # a 2-D NumPy view over the same memory: bulk math, no copies
+            if len(memv):
+                rows = numpy.frombuffer(memv, dtype=self.typecode)
+            else:
+                rows = numpy.empty(0, dtype=self.typecode)
+            self._rows = rows.reshape(count, dim)
+        else:
+            self._rows = None
+
+    def __len__(self):
+        return self._count
+
+    def _row(self, index):
+        start = index * self.dim
+        return self._memv[start:start + self.dim]
+
+    def __iter__(self):
+        return (Vector._frombuffer(self._row(i)) for i in range(self._count))
+
+    def __getitem__(self, index):
+        cls = type(self)
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._count)
+            if step == 1:
+                memv = self._memv[start * self.dim:max(start, stop) * self.dim]
+                return cls.frombuffer(memv, self.dim, self.typecode)
+            return cls((self[i] for i in range(start, stop, step)), self.dim, self.typecode)
+        elif isinstance(index, numbers.Integral):
+            if index < 0:
+                index += self._count
+            if not 0 <= index < self._count:
+                raise IndexError('{.__name__} index out of range'.format(cls))
+            return Vector._frombuffer(self._row(index))
+        else:
+            msg = '{.__name__} indices must be integers or slices'
+            raise TypeError(msg.format(cls))
+
+    def __repr__(self):
+        rows = (row.tolist() for row in map(self._row, range(min(self._count, 7))))
+        return '{}({}, dim={})'.format(type(self).__name__, reprlib.repr(list(rows)), self.dim)
+
+    def __abs__(self):
+        """Euclidean norm of every vector, in one batch"""
+        if self._rows is not None:
+            # in doubles, like the fallback: 'h' rows would wrap, 'f' ones round
+            return numpy.sqrt(numpy.einsum('ij,ij->i', self._rows, self._rows, dtype='d'))
+        return array('d', (math.hypot(*self._row(i)) for i in range(self._count)))
+
+    def __matmul__(self, other):
+        """Pairwise dot products with a VectorArray, or every row @ one vector"""
+        if isinstance(other, VectorArray):
+            if len(other) != self._count or other.dim != self.dim:
+                return NotImplemented
+            if self._rows is not None:
+                return numpy.einsum('ij,ij->i', self._rows, other._rows, dtype='d')
+            others = map(other._row, range(self._count))
+        else:
+            try:
+                other = array('d', other)
+            except TypeError:
+                return NotImplemented
+            if len(other) != self.dim:
+                return NotImplemented
+            if self._rows is not None:
+                return self._rows @ numpy.frombuffer(other, dtype='d')
+            others = itertools.repeat(other, self._count)
+        rows = map(self._row, range(self._count))
+        return array('d', (sum(map(operator.mul, a, b)) for a, b in zip(rows, others)))
+
+    def distances(self, vector):
+        """Euclidean distance from every vector to ``vector``, in one batch"""
+        vector = array('d', vector)
+        if len(vector) != self.dim:
+            msg = 'expected a vector of dimension {}, got {}'
+            raise ValueError(msg.format(self.dim, len(vector)))
+        if self._rows is not None:
+            deltas = self._rows - numpy.frombuffer(vector, dtype='d')
+            return numpy.sqrt(numpy.einsum('ij,ij->i', deltas, deltas))
+        return array('d', map(math.dist, map(self._row, range(self._count)),
+                              itertools.repeat(vector)))
+
+    def equal(self, other):
+        """Mask telling which vectors are == to the matching one in other
+        (another VectorArray), or to other itself (a single vector)"""
+        if isinstance(other, VectorArray):
+            if len(other) != self._count:
+                raise ValueError('cannot compare VectorArrays of different lengths')
+            if self._rows is not None and other.dim == self.dim:
+                return (self._rows == other._rows).all(axis=1)
+            others = map(other._row, range(self._count))
+        else:
+            other = list(other)  # read once: a failed conversion must not consume it
+            try:
+                other = memoryview(array(self.typecode, other))
+            except (TypeError, OverflowError):
+                # 1.5 or 2**40 fit no 'h' row, but they still make a vector to compare
+                other = memoryview(array('d', other))
+            if self._rows is not None and len(other) == self.dim:
+                return (self._rows == numpy.frombuffer(other, dtype=other.format)).all(axis=1)
+            others = itertools.repeat(other, self._count)
+        # memoryviews compare item by item in C, with the same semantics as Vector.__eq__
+        rows = map(self._row, range(self._count))
+        return [a == b for a, b in zip(rows, others)]
+
+    def hashes(self):
+        """hash() of every vector, without building a Vector for each of them"""
+        xor = functools.partial(functools.reduce, operator.xor)
+        return [xor(map(hash, self._row(i)), 0) for i in range(self._count)]
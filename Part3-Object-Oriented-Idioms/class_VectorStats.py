@@ -0,0 +1,173 @@
+"""
+Streaming per-dimension statistics over ``Vector`` streams
+
+``sum(vectors, Vector2([0, 0]))`` builds a new Vector2 for every element,
+and the variance needs a second pass, or the numerically fragile
+E[x**2] - E[x]**2. ``VectorStats`` keeps the count, plus the mean, sum of
+squared deviations (M2), min and max of every dimension in four preallocated
+arrays, updated with Welford's algorithm: one pass, constant memory, stable::
+
+    >>> stats = VectorStats()
+    >>> for v in [Vector2([1, 10]), Vector2([2, 20]), Vector2([3, 60])]:
+    ...     stats.update(v)
+    >>> stats
+    VectorStats(count=3, dim=2)
+    >>> stats.mean, stats.min, stats.max
+    (Vector([2.0, 30.0]), Vector([1.0, 10.0]), Vector([3.0, 60.0]))
+    >>> stats.variance()  # population variance
+    Vector([0.6666666666666666, 466.6666666666667])
+    >>> stats.variance(ddof=1)  # sample variance
+    Vector([1.0, 700.0])
+    >>> stats.update([1, 2, 3])
+    Traceback (most recent call last):
+      ...
+    ValueError: expected a vector of dimension 2, got 3
+
+
+``update_many`` consumes an iterable in chunks: each chunk is summarized
+column by column (with NumPy when it is installed), then merged in::
+
+    >>> import random, statistics
+    >>> rnd = random.Random(1)
+    >>> data = [[rnd.gauss(5, 2), rnd.uniform(-1, 1)] for _ in range(1000)]
+    >>> many = VectorStats()
+    >>> many.update_many(iter(data), chunk_size=64)
+    >>> expected = [statistics.pvariance(column) for column in zip(*data)]
+    >>> all(math.isclose(a, b) for a, b in zip(many.variance(), expected))
+    True
+
+
+``merge`` combines partial results, e.g. from parallel workers, with the
+pairwise formula of Chan et al.::
+
+    >>> left, right = VectorStats(), VectorStats()
+    >>> left.update_many(data[:300])
+    >>> right.update_many(data[300:])
+    >>> left.merge(right)
+    >>> left.count, all(map(math.isclose, left.mean, many.mean))
+    (1000, True)
+    >>> all(map(math.isclose, left.variance(), many.variance()))
+    True
+    >>> left.min == many.min and left.max == many.max
+    True
+"""
+
+from array import array
+import itertools
+import math
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional: fall back to array + builtins
+    numpy = None
+
+from class_VectorArray import VectorArray
+from operator_overloading import Vector2
+
+CHUNK_SIZE = 4096  # vectors summarized at a time by update_many
+
+
+class VectorStats:
+    def __init__(self, dim=None):
+        self.count = 0
+        self.dim = None
+        if dim is not None:
+            self._allocate(dim)
+
+    def _allocate(self, dim):
+        self.dim = dim
+        zeros = array('d', [0.0]) * dim
+        self._mean, self._m2 = zeros, zeros[:]
+        self._min = array('d', [math.inf]) * dim
+        self._max = array('d', [-math.inf]) * dim
+
+    def _check(self, dim):
+        if self.dim is None:
+            self._allocate(dim)
+        elif dim != self.dim:
+            msg = 'expected a vector of dimension {}, got {}'
+            raise ValueError(msg.format(self.dim, dim))
+
+    def __repr__(self):
+        return '{}(count={}, dim={})'.format(type(self).__name__, self.count, self.dim)
+
+    def update(self, vector):
+        """Welford's update with one vector"""
+        vector = array('d', vector)
+        self._check(len(vector))
+        self.count += 1
+        n = self.count
+        mean, m2, low, high = self._mean, self._m2, self._min, self._max
+        for i, x in enumerate(vector):
+            delta = x - mean[i]
+            mean[i] += delta / n
+            m2[i] += delta * (x - mean[i])
+            if x < low[i]:
+                low[i] = x
+            if x > high[i]:
+                high[i] = x
+
+    def update_many(self, vectors, chunk_size=CHUNK_SIZE):
+        """Update with every vector of an iterable, one chunk at a time"""
+        vectors = iter(vectors)
+        while True:
+            chunk = VectorArray(itertools.islice(vectors, chunk_size), self.dim)
+            if not len(chunk):
+                return
+            self._merge_summary(len(chunk), chunk.dim, *self._summarize(chunk))
+
+    @staticmethod
+    def _summarize(chunk):
+        """Per-column mean, M2, min and max of a VectorArray"""
+        if chunk._rows is not None:
+            rows = chunk._rows
+            mean = rows.mean(axis=0)
+            m2 = ((rows - mean) ** 2).sum(axis=0)
+            low, high = rows.min(axis=0), rows.max(axis=0)
+            return mean.tolist(), m2.tolist(), low.tolist(), high.tolist()
+        columns = list(zip(*map(chunk._row, range(len(chunk)))))
+        means = [math.fsum(column) / len(column) for column in columns]
+        m2s = [math.fsum((x - mean) ** 2 for x in column)
+               for column, mean in zip(columns, means)]
+        return means, m2s, list(map(min, columns)), list(map(max, columns))
+
+    def _merge_summary(self, count, dim, means, m2s, mins, maxs):
+        """Chan et al.: fold in the summary of another set of ``count`` vectors"""
+        if not count:
+            return
+        self._check(dim)
+        total = self.count + count
+        weight = self.count * count / total
+        for i, (mean, m2) in enumerate(zip(means, m2s)):
+            delta = mean - self._mean[i]
+            self._mean[i] += delta * count / total
+            self._m2[i] += m2 + delta * delta * weight
+        self._min = array('d', map(min, self._min, mins))
+        self._max = array('d', map(max, self._max, maxs))
+        self.count = total
+
+    def merge(self, other):
+        """Fold the statistics of other, a VectorStats, into self"""
+        self._merge_summary(other.count, other.dim, other._mean, other._m2,
+                            other._min, other._max)
+
+    @property
+    def mean(self):
+        return Vector2(self._mean)
+
+    @property
+    def min(self):
+        return Vector2(self._min)
+
+    @property
+    def max(self):
+        return Vector2(self._max)
+
+    def variance(self, ddof=0):
+        """Population variance by default; ddof=1 for the sample variance"""
+        if self.count <= ddof:
+            raise ValueError('variance needs more than {} vectors'.format(ddof))
+        return Vector2(m2 / (self.count - ddof) for m2 in self._m2)
+
+    def stdev(self, ddof=0):
+        return Vector2(map(math.sqrt, self.variance(ddof)))
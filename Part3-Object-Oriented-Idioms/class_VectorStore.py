@@ -0,0 +1,178 @@
+"""
+A memory-mapped on-disk store of ``Vector`` instances
+
+Writing ``bytes(v)`` blobs one by one means reading and parsing all of them
+back at startup. A ``VectorStore`` file is one fixed 32-byte header followed
+by the components of every vector, packed back to back::
+
+    magic b'VECS' | version | typecode | dim | count | padding
+
+The file is opened with ``mmap``: opening costs the same for 1 KB and 10 GB,
+and ``store[i]`` is a ``Vector`` view over the mapped pages, found in O(1) by
+offset arithmetic. The OS pages in only what is actually read.
+
+    >>> import os, tempfile
+    >>> path = os.path.join(tempfile.mkdtemp(), 'vectors.vecs')
+    >>> with VectorStore.create(path, dim=3) as store:
+    ...     store.append(Vector([1, 2, 3]))
+    ...     store.extend(Vector([i, i, i]) for i in range(10))
+    ...     len(store)
+    11
+
+
+Random access and bulk slicing, without reading the whole file::
+
+    >>> store = VectorStore(path)
+    >>> store  # doctest:+ELLIPSIS
+    VectorStore('...vectors.vecs', typecode='d', dim=3, count=11)
+    >>> store[0]
+    Vector([1.0, 2.0, 3.0])
+    >>> store[-1], abs(store[-1])  # doctest:+ELLIPSIS
+    (Vector([9.0, 9.0, 9.0]), 15.588457...)
+    >>> store[2:5]
+    VectorArray([[1.0, 1.0, 1.0], [2.0, 2.0, 2.0], [3.0, 3.0, 3.0]], dim=3)
+    >>> store[11]
+    Traceback (most recent call last):
+      ...
+    IndexError: VectorStore index out of range
+
+
+A read-only store refuses appends; reopen it with ``mode='r+'`` to grow it::
+
+    >>> store.append(Vector([0, 0, 0]))
+    Traceback (most recent call last):
+      ...
+    io.UnsupportedOperation: write
+    >>> store.close()
+    >>> with VectorStore(path, mode='r+') as store:
+    ...     store.append([7, 7, 7])
+    ...     store[11], len(store)
+    (Vector([7.0, 7.0, 7.0]), 12)
+    >>> with VectorStore(path, mode='r+') as store:
+    ...     store.append([1, 2])
+    Traceback (most recent call last):
+      ...
+    ValueError: expected a vector of dimension 3, got 2
+"""
+
+from array import array
+import mmap
+import numbers
+import os
+import struct
+
+from class_Vector import Vector
+from class_VectorArray import VectorArray
+
+# magic, version, typecode, dim, count; padded so the components are 8-byte aligned
+HEADER = struct.Struct('<4sBc2xIQ12x')
+COUNT_OFFSET = 12  # where ``count`` lives in the header, rewritten on every append
+MAGIC = b'VECS'
+VERSION = 1
+
+
+class VectorStore:
+    """Components are stored in native byte order, like ``bytes(v)``"""
+
+    def __init__(self, path, mode='r'):
+        if mode not in ('r', 'r+'):
+            raise ValueError("mode must be 'r' or 'r+', not {!r}".format(mode))
+        self.path = path
+        self._file = open(path, mode + 'b')
+        self._access = mmap.ACCESS_READ if mode == 'r' else mmap.ACCESS_WRITE
+        header = self._file.read(HEADER.size)
+        if len(header) < HEADER.size or header[:4] != MAGIC:
+            self._file.close()
+            raise ValueError('{!r} is not a VectorStore file'.format(path))
+        magic, version, typecode, self.dim, self._count = HEADER.unpack(header)
+        self.typecode = typecode.decode()
+        self._itemsize = array(self.typecode).itemsize
+        self._mmap = self._memv = None
+        self._map()
+
+    @classmethod
+    def create(cls, path, dim, typecode='d'):
+        """Write an empty store and open it for appending"""
+        with open(path, 'wb') as fp:
+            fp.write(HEADER.pack(MAGIC, VERSION, typecode.encode(), dim, 0))
+        return cls(path, mode='r+')
+
+    def _map(self):
+        # the old map is not closed: Vector views handed out may still use it,
+        # it goes away with the last of them
+        size = HEADER.size + self._count * self.dim * self._itemsize
+        if os.fstat(self._file.fileno()).st_size < size:
+            raise ValueError('{!r} is truncated'.format(self.path))
+        self._mmap = mmap.mmap(self._file.fileno(), size, access=self._access)
+        self._memv = memoryview(self._mmap)[HEADER.size:].cast(self.typecode)
+
+    def __len__(self):
+        return self._count
+
+    def __repr__(self):
+        fmt = '{}({!r}, typecode={!r}, dim={}, count={})'
+        return fmt.format(type(self).__name__, self.path, self.typecode, self.dim, self._count)
+
+    def __getitem__(self, index):
+        cls = type(self)
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._count)
+            if step == 1:
+                memv = self._memv[start * self.dim:max(start, stop) * self.dim]
+                return VectorArray.frombuffer(memv, self.dim, self.typecode)
+            return VectorArray((self[i] for i in range(start, stop, step)), self.dim,
+                               self.typecode)
+        elif isinstance(index, numbers.Integral):
+            if index < 0:
+                index += self._count
+            if not 0 <= index < self._count:
+                raise IndexError('{.__name__} index out of range'.format(cls))
+            start = index * self.dim
+            return Vector._frombuffer(self._memv[start:start + self.dim])
+        else:
+            msg = '{.__name__} indices must be integers or slices'
+            raise TypeError(msg.format(cls))
+
+    def __iter__(self):
+        return (self[i] for i in range(self._count))
+
+    def append(self, vector):
+        self.extend([vector])
+
+    def extend(self, vectors, chunk_size=65536):
+        """Append vectors, writing them in chunks of ``chunk_size`` vectors"""
+        chunk, added = array(self.typecode), 0
+        # not SEEK_END: a failed extend may have left unaccounted bytes there
+        self._file.seek(HEADER.size + self._count * self.dim * self._itemsize)
+        for vector in vectors:
+            before = len(chunk)
+            chunk.extend(vector)
+            size = len(chunk) - before
+            if size != self.dim:
+                msg = 'expected a vector of dimension {}, got {}'
+                raise ValueError(msg.format(self.dim, size))
+            added += 1
+            if added % chunk_size == 0:
+                self._file.write(chunk)
+                del chunk[:]
+        self._file.write(chunk)
+        if added:
+            self._count += added
+            self._file.seek(COUNT_OFFSET)
+            self._file.write(struct.pack('<Q', self._count))
+            self._file.flush()
+            self._map()
+
+    def close(self):
+        self._memv.release()
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass  # Vector views still use the map: it is closed when they are gone
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,178 @@
+"""
+Compression codecs for the blocks written by ``Vector.dump_many``
+
+Raw 8-byte doubles hardly compress: their low mantissa bits look random. A
+codec is a transform, a compressor, or a transform then a compressor, named
+like ``'q8+zlib'``:
+
+- ``'q8'``, ``'q16'``: quantize every component to 8 or 16 bits, with a
+  scale and an offset per dimension and block. Lossy: the error is at most
+  half a step, (max - min) / 255 or / 65535 of the dimension in the block.
+  Blocks holding NaN or infinities are stored unquantized instead.
+- ``'xor'``: XOR every vector with the previous one, bit for bit. Lossless;
+  close consecutive vectors share sign, exponent and high mantissa bits,
+  which become zero bytes for the compressor. Noisy low mantissa bits stay
+  noisy, so on floats the big savings come from the quantizers.
+- ``'zlib'``, ``'lzma'``: compress the (transformed) block.
+
+``dump_many`` records the codec in every block header, and ``iter_load``
+decodes one block at a time::
+
+    >>> from class_Vector import Vector
+    >>> import io, math
+    >>> track = [Vector([math.sin(i / 500), math.cos(i / 500), i / 1000]) for i in range(2000)]
+    >>> def size(codec):
+    ...     f = io.BytesIO()
+    ...     Vector.dump_many(track, f, codec)
+    ...     return len(f.getvalue())
+    >>> raw = size(None)
+    >>> ratios = {codec: raw / size(codec)
+    ...           for codec in ['zlib', 'xor+zlib', 'xor+lzma', 'q16+zlib', 'q8+lzma']}
+    >>> min(ratios.values()) > 1, ratios['q16+zlib'] > 3, ratios['q8+lzma'] > 10
+    (True, True, True)
+
+About 1.3x for zlib, 1.4x for xor+zlib, 1.7x for xor+lzma, 4x for q16+zlib,
+and 34x for q8+lzma here; the exact figures depend on the zlib and lzma builds.
+
+
+The lossless codecs give back the same vectors, the quantizers close ones::
+
+    >>> def round_trip(codec):
+    ...     f = io.BytesIO()
+    ...     Vector.dump_many(track, f, codec)
+    ...     _ = f.seek(0)
+    ...     return list(Vector.iter_load(f))
+    >>> round_trip('xor+lzma') == track
+    True
+    >>> decoded = round_trip('q16')
+    >>> max(abs(a - b) for u, v in zip(track, decoded) for a, b in zip(u, v)) < 2 / 65535
+    True
+    >>> Vector.dump_many([Vector([1, 2], typecode='i')], io.BytesIO(), 'q8')
+    Traceback (most recent call last):
+      ...
+    ValueError: only float vectors can be quantized, not typecode 'i'
+    >>> odd = [Vector([1, 2]), Vector([math.nan, math.inf])]
+    >>> f = io.BytesIO()
+    >>> Vector.dump_many(odd, f, 'q8+zlib')
+    2
+    >>> _ = f.seek(0)
+    >>> list(Vector.iter_load(f))
+    [Vector([1.0, 2.0]), Vector([nan, inf])]
+    >>> codec_id('q8+gzip')
+    Traceback (most recent call last):
+      ...
+    ValueError: unknown codec 'q8+gzip'
+"""
+
+from array import array
+import itertools
+import lzma
+import math
+import operator
+import zlib
+
+
+# the codec byte: the transform in the low nibble, the compressor in the high one
+TRANSFORMS = {None: 0, 'q8': 1, 'q16': 2, 'xor': 3}
+COMPRESSORS = {None: 0, 'zlib': 1, 'lzma': 2}
+QUANTIZED = {1: 'B', 2: 'H'}  # transform -> typecode of the quantized codes
+XOR = 3
+COMPRESS = {1: zlib.compress, 2: lzma.compress}
+DECOMPRESS = {1: zlib.decompress, 2: lzma.decompress}
+
+
+def codec_id(name):
+    """The codec byte for a name like 'q8+zlib'; None is 0, no codec"""
+    transform = compressor = None
+    for part in name.split('+') if name else ():
+        if part in TRANSFORMS and transform is None:
+            transform = part
+        elif part in COMPRESSORS and compressor is None:
+            compressor = part
+        else:
+            raise ValueError('unknown codec {!r}'.format(name))
+    return TRANSFORMS[transform] | COMPRESSORS[compressor] << 4
+
+
+def block_codec(codec, block):
+    """The codec byte to write block with: quantizers cannot represent NaN or
+    infinities, so such float blocks fall back to the compressor alone"""
+    if codec & 0xF in QUANTIZED and block.typecode in 'fd' and not all(map(math.isfinite, block)):
+        return codec & 0xF0
+    return codec
+
+
+def encode(codec, block, dim):
+    """The payload of a block: the array of its components, back to back"""
+    transform, compressor = codec & 0xF, codec >> 4
+    if transform in QUANTIZED:
+        payload = _quantize(block, dim, QUANTIZED[transform])
+    elif transform == XOR:
+        payload = _xor_delta(block, dim)
+    else:
+        payload = bytes(block)
+    if compressor:
+        payload = COMPRESS[compressor](payload)
+    return payload
+
+
+def decode(codec, payload, typecode, dim):
+    """The array of the components of a block, from its payload"""
+    transform, compressor = codec & 0xF, codec >> 4
+    if (compressor and compressor not in DECOMPRESS) or transform > XOR:
+        raise ValueError('unknown codec byte {:#04x}'.format(codec))
+    if compressor:
+        payload = DECOMPRESS[compressor](payload)
+    if transform in QUANTIZED:
+        return _dequantize(payload, typecode, dim, QUANTIZED[transform])
+    elif transform == XOR:
+        payload = _xor_undelta(payload, dim * array(typecode).itemsize)
+    return array(typecode, payload)
+
+
+def _quantize(block, dim, code_typecode):
+    """Per dimension: offsets (min), then scales (step), then the codes"""
+    if block.typecode not in 'fd':
+        msg = 'only float vectors can be quantized, not typecode {!r}'
+        raise ValueError(msg.format(block.typecode))
+    if not all(map(math.isfinite, block)):
+        raise ValueError('only finite components can be quantized, not NaN or infinities')
+    levels = 2 ** (8 * array(code_typecode).itemsize) - 1
+    columns = [block[i::dim] for i in range(dim)]
+    offsets = array('d', map(min, columns))
+    scales = array('d', [(max(column) - low) / levels or 1.0
+                         for column, low in zip(columns, offsets)])
+    shifted = map(operator.sub, block, itertools.cycle(offsets))
+    codes = array(code_typecode, map(round, map(operator.truediv, shifted,
+                                                itertools.cycle(scales))))
+    return b''.join((offsets, scales, codes))
+
+
+def _dequantize(payload, typecode, dim, code_typecode):
+    memv = memoryview(payload)
+    params = memv[:2 * dim * array('d').itemsize].cast('d')
+    offsets, scales = params[:dim], params[dim:]
+    codes = memv[len(params) * params.itemsize:].cast(code_typecode)
+    steps = map(operator.mul, codes, itertools.cycle(scales))
+    return array(typecode, map(operator.add, itertools.cycle(offsets), steps))
+
+
+def _xor_delta(block, dim):
+    """Each vector XOR the previous one, as one big int per vector"""
+    raw = memoryview(block).cast('B')
+    width = dim * block.itemsize
+    out, previous = bytearray(), 0
+    for start in range(0, len(raw), width or 1):
+        row = int.from_bytes(raw[start:start + width], 'little')
+        out += (row ^ previous).to_bytes(width, 'little')
+        previous = row
+    return bytes(out)
+
+
+def _xor_undelta(payload, width):
+    out, previous = bytearray(), 0
+    for start in range(0, len(payload), width or 1):
+        previous ^= int.from_bytes(payload[start:start + width], 'little')
+        out += previous.to_bytes(width, 'little')
+    return bytes(out)
+
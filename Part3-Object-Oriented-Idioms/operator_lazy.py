@@ -0,0 +1,200 @@
+"""
+Lazy, fused arithmetic for ``Vector2``
+
+Each ``Vector2`` operator builds a brand-new vector, so ``a + b * 3 - c``
+allocates temporaries and runs one interpreted loop per operator. Wrapping
+the operands with ``lazy()`` makes the same operators build an expression
+tree instead. The tree is evaluated when the result is materialized: it is
+compiled into ONE element-wise function and mapped over all the operands in
+a single pass.
+
+    >>> a, b, c = Vector2([1, 2, 3]), Vector2([10, 20, 30]), Vector2([5, 5, 5])
+    >>> expr = lazy(a) + lazy(b) * 3 - lazy(c)
+    >>> expr
+    <LazyVector ((x0 + (x1 * s0)) - x2)>
+    >>> expr.evaluate()
+    Vector([26.0, 57.0, 88.0])
+    >>> expr.evaluate() == a + b * 3 + -c
+    True
+
+
+Plain vectors and iterables mixed into a lazy expression become operands,
+and shorter operands are filled with 0, as with ``Vector2``::
+
+    >>> (-lazy(a) + (1, 1)).evaluate()
+    Vector([0.0, -1.0, -3.0])
+    >>> a + lazy(b), a - lazy(b), 2 * lazy(b)
+    (<LazyVector (x0 + x1)>, <LazyVector (x0 - x1)>, <LazyVector (x0 * s0)>)
+    >>> (a + lazy(b) * 3 - c).evaluate() == expr.evaluate()
+    True
+    >>> len(lazy(a) + [1, 2, 3, 4])
+    4
+
+
+The result gets the typecode the eager operators would give it::
+
+    >>> vh = Vector2([1, 2], typecode='h')
+    >>> (lazy(vh) + lazy(vh)).evaluate(), (vh + vh).typecode
+    (Vector([2, 4], typecode='h'), 'h')
+    >>> (lazy(vh) * 0.5).evaluate(), (lazy(vh) + (1,)).evaluate()
+    (Vector([0.5, 1.0]), Vector([2.0, 2.0]))
+    >>> lazy(a) * lazy(b)
+    Traceback (most recent call last):
+      ...
+    TypeError: unsupported operand type(s) for *: 'LazyVector' and 'LazyVector'
+
+
+Materializing: ``evaluate()``, or anything that iterates, like ``Vector2()``.
+With ``out``, the result is written into a preallocated buffer in place::
+
+    >>> Vector2(2 * lazy(a))
+    Vector([2.0, 4.0, 6.0])
+    >>> from array import array
+    >>> out = array('d', [0, 0, 0])
+    >>> expr.evaluate(out) is out
+    True
+    >>> out
+    array('d', [26.0, 57.0, 88.0])
+    >>> expr.evaluate(array('d', [0, 0]))
+    Traceback (most recent call last):
+      ...
+    ValueError: out has 2 items, the expression has 3
+"""
+
+from array import array
+import functools
+import itertools
+import numbers
+
+from class_Vector import Vector, promote, promote_scalar
+from operator_overloading import Vector2
+
+CHUNK_SIZE = 4096  # items computed per slice assignment when writing into ``out``
+
+
+def lazy(vector):
+    """Wrap vector so that operators on it build a LazyVector expression"""
+    if isinstance(vector, LazyVector):
+        return vector
+    # Vectors lend their storage; SparseVector has none, so it is densified like any iterable
+    components = getattr(vector, '_components', None) if isinstance(vector, Vector) else None
+    return LazyVector('leaf', array('d', vector) if components is None else components)
+
+
+@functools.lru_cache(maxsize=256)
+def _compile(source, n_leaves, n_scalars):
+    """Compile the element-wise function for an expression shape, once per shape.
+    Only generated names and operators go into ``source``, never values"""
+    leaves = ', '.join('x{}'.format(i) for i in range(n_leaves))
+    scalars = ', '.join('s{}'.format(i) for i in range(n_scalars))
+    factory = 'lambda {}: lambda {}: {}'.format(scalars, leaves, source)
+    return eval(factory)
+
+
+class LazyVector:
+    """A node of an expression tree: a leaf holding components, or an operator"""
+    __slots__ = ('_op', '_args')
+
+    _lazy = True  # Vector2 + LazyVector returns NotImplemented, so __radd__ runs
+
+    def __init__(self, op, *args):
+        self._op = op
+        self._args = args
+
+    def _source(self, leaves, scalars):
+        """Python source of this node, collecting its leaves and scalars"""
+        op, args = self._op, self._args
+        if op == 'leaf':
+            for i, leaf in enumerate(leaves):
+                if leaf is args[0]:  # the same operand twice is read once
+                    return 'x{}'.format(i)
+            leaves.append(args[0])
+            return 'x{}'.format(len(leaves) - 1)
+        elif op == '-x':
+            return '(-{})'.format(args[0]._source(leaves, scalars))
+        elif op == '*':
+            scalars.append(args[1])
+            return '({} * s{})'.format(args[0]._source(leaves, scalars), len(scalars) - 1)
+        else:
+            left, right = (arg._source(leaves, scalars) for arg in args)
+            return '({} {} {})'.format(left, op, right)
+
+    def _compiled(self):
+        leaves, scalars = [], []
+        source = self._source(leaves, scalars)
+        func = _compile(source, len(leaves), len(scalars))(*scalars)
+        return func, leaves, source, scalars
+
+    def _typecode(self, leaves, scalars):
+        """The typecode eager Vector2 operators would give the result"""
+        typecode = promote(*(getattr(leaf, 'typecode', None) or leaf.format for leaf in leaves))
+        for scalar in scalars:
+            typecode = promote_scalar(typecode, scalar)
+        return typecode
+
+    def __repr__(self):
+        return '<{} {}>'.format(type(self).__name__, self._compiled()[2])
+
+    def __len__(self):
+        return max(map(len, self._compiled()[1]))
+
+    def evaluate(self, out=None):
+        """Compute the expression in one pass, into a new Vector2 or into out"""
+        func, leaves, _, scalars = self._compiled()
+        size = max(map(len, leaves))
+        if all(len(leaf) == size for leaf in leaves):
+            values = map(func, *leaves)
+        else:
+            # 0, not 0.0, as in Vector2.__add__: integers stay integers
+            values = itertools.starmap(func, itertools.zip_longest(*leaves, fillvalue=0))
+        if out is None:
+            return Vector2._frombuffer(array(self._typecode(leaves, scalars), values))
+        target = memoryview(out._components if isinstance(out, Vector) else out)
+        if len(target) != size:
+            raise ValueError('out has {} items, the expression has {}'.format(len(target), size))
+        for start in range(0, size, CHUNK_SIZE):
+            chunk = array(target.format, itertools.islice(values, CHUNK_SIZE))
+            target[start:start + len(chunk)] = chunk
+        return out
+
+    def __iter__(self):
+        return iter(self.evaluate())
+
+    def __neg__(self):
+        return LazyVector('-x', self)
+
+    def __pos__(self):
+        return self
+
+    def __add__(self, other):
+        try:
+            return LazyVector('+', self, lazy(other))
+        except TypeError:
+            return NotImplemented
+
+    def __radd__(self, other):
+        try:
+            return LazyVector('+', lazy(other), self)
+        except TypeError:
+            return NotImplemented
+
+    def __sub__(self, other):
+        try:
+            return LazyVector('-', self, lazy(other))
+        except TypeError:
+            return NotImplemented
+
+    def __rsub__(self, other):
+        try:
+            return LazyVector('-', lazy(other), self)
+        except TypeError:
+            return NotImplemented
+
+    def __mul__(self, scalar):
+        if isinstance(scalar, numbers.Real):
+            return LazyVector('*', self, scalar)
+        else:
+            return NotImplemented
+
+    def __rmul__(self, scalar):
+        return self * scalar
@@ -1,8 +1,11 @@
 import itertools
 import numbers
+import operator
+
+from array import array
 
 from abc_tombola import BingoCage, Tombola
-from class_Vector import Vector
+from class_Vector import Vector, promote, promote_scalar
 
 
 class Vector2(Vector):
@@ -141,14 +144,30 @@ class Vector2(Vector):
         >>> v1 *= 11
         >>> v1
         Vector([55.0, 77.0, 99.0])
+
+    Typecode promotion rules: see ``class_Vector.promote``. Integers are not
+    wrapped around on overflow, the array raises OverflowError instead::
+
+        >>> vb = Vector2([1, 2], typecode='b')
+        >>> (vb + Vector2([1, 2], typecode='h')).typecode, (vb + vb).typecode
+        ('h', 'b')
+        >>> (vb + Vector2([1], typecode='f')).typecode, (vb + (1, 2)).typecode
+        ('f', 'd')
+        >>> (vb * 2).typecode, (vb * 0.5).typecode, (-vb).typecode
+        ('b', 'd', 'b')
+        >>> vb * 100
+        Traceback (most recent call last):
+          ...
+        OverflowError: signed char is greater than maximum
     """
+    __slots__ = ()  # no __dict__, like Vector
 
     def __neg__(self):
         """always return a new object, do not modify self"""
-        return Vector2(-x for x in self)
+        return Vector2((-x for x in self), self.typecode)
 
     def __pos__(self):
-        return Vector2(self)
+        return Vector2(self, self.typecode)
 
     def __add__(self, other):
         """
@@ -162,9 +181,14 @@ class Vector2(Vector):
         it should return NotImplemented and not raise TypeError. This allows the interpreter
         to try calling the reversed operator method, which may correctly handle it.
         """
+        if getattr(other, '_lazy', False):
+            return NotImplemented  # let a LazyVector build the expression, in __radd__
         try:
-            pairs = itertools.zip_longest(self, other, fillvalue=0.0)
-            return Vector2(a + b for a, b in pairs)
+            # vectors of unknown typecode, like tuples, count as 'd'
+            typecode = promote(self.typecode, getattr(other, 'typecode', 'd'))
+            # 0, not 0.0: adding it changes no value, and keeps integers integers
+            pairs = itertools.zip_longest(self, other, fillvalue=0)
+            return Vector2((a + b for a, b in pairs), typecode)
         except TypeError:
             return NotImplemented
 
@@ -188,7 +212,7 @@ class Vector2(Vector):
         types, as long as they support the necessary operations.
         """
         if isinstance(scalar, numbers.Real):
-            return Vector2(n * scalar for n in self)
+            return Vector2((n * scalar for n in self), promote_scalar(self.typecode, scalar))
         else:
             return NotImplemented
 
@@ -196,6 +220,10 @@ class Vector2(Vector):
         return self * scalar
 
     def __matmul__(self, other):
+        if (isinstance(other, Vector) and hasattr(other, '_components') and
+                min(len(self), len(other)) >= self.parallel_threshold):
+            import parallel_reduce  # only huge vectors pay for the import
+            return parallel_reduce.dot(self._components, other._components)
         try:
             return sum(a * b for a, b in zip(self, other))
         except TypeError:
@@ -205,6 +233,188 @@ class Vector2(Vector):
         return self @ other
 
 
+class MutableVector(Vector2):
+    """
+    A mutable companion to Vector2, for accumulation loops
+
+    ``acc += v`` with an immutable Vector2 builds a new Vector2 and a new array
+    on every iteration. MutableVector implements the in-place operators by
+    writing into its own array, so a long reduction builds no intermediate
+    vectors: each update is computed into one scratch array, then copied in.
+
+        >>> acc = MutableVector.zeros(3)
+        >>> acc_alias = acc
+        >>> for v in [Vector2([1, 2, 3]), Vector2([4, 5, 6])]:
+        ...     acc += v
+        >>> acc
+        Vector([5.0, 7.0, 9.0])
+        >>> acc -= (1, 1, 1)
+        >>> acc *= 10
+        >>> acc.add_scaled([1, 1], 0.5)
+        Vector([40.5, 60.5, 80.0])
+        >>> acc is acc_alias
+        True
+
+
+    Like ``+``, a longer operand extends the vector with its extra components.
+    Unsuitable operands fail the way ``+`` and ``*`` do::
+
+        >>> acc += [0, 0, 0, 1]
+        >>> acc
+        Vector([40.5, 60.5, 80.0, 1.0])
+        >>> acc += 1
+        Traceback (most recent call last):
+          ...
+        TypeError: unsupported operand type(s) for +=: 'MutableVector' and 'int'
+        >>> acc *= 'A'
+        Traceback (most recent call last):
+          ...
+        TypeError: unsupported operand type(s) for *=: 'MutableVector' and 'str'
+
+
+    Updates are all or nothing, and promote the typecode the way ``+`` and
+    ``*`` do, without a new object::
+
+        >>> acc += [10, 'x', 10]
+        Traceback (most recent call last):
+          ...
+        TypeError: unsupported operand type(s) for +=: 'MutableVector' and 'list'
+        >>> acc
+        Vector([40.5, 60.5, 80.0, 1.0])
+        >>> ai = ai_alias = MutableVector([1, 2], typecode='i')
+        >>> ai += MutableVector([1, 3], typecode='b')
+        >>> ai
+        Vector([2, 5], typecode='i')
+        >>> ai *= 0.5
+        >>> ai, ai is ai_alias
+        (Vector([1.0, 2.5]), True)
+        >>> ab = MutableVector([1, 2], typecode='b')
+        >>> ab *= 100
+        Traceback (most recent call last):
+          ...
+        OverflowError: signed char is greater than maximum
+        >>> ab
+        Vector([1, 2], typecode='b')
+
+
+    Mutable objects must not be hashable. ``freeze()`` copies the array in one
+    go into an immutable, hashable Vector2::
+
+        >>> hash(acc)
+        Traceback (most recent call last):
+          ...
+        TypeError: unhashable type: 'MutableVector'
+        >>> frozen = acc.freeze()
+        >>> acc[0] = 0
+        >>> frozen, acc
+        (Vector([40.5, 60.5, 80.0, 1.0]), Vector([0.0, 60.5, 80.0, 1.0]))
+        >>> type(frozen).__name__, hash(frozen) == hash(Vector2(frozen))
+        ('Vector2', True)
+
+
+    Unpickled, even from an out-of-band buffer, a MutableVector owns a copy
+    of its components, so it can still grow::
+
+        >>> import pickle
+        >>> buffers = []
+        >>> data = pickle.dumps(acc, protocol=5, buffer_callback=buffers.append)
+        >>> clone = pickle.loads(data, buffers=buffers)
+        >>> clone += [1, 1, 1, 1, 1]
+        >>> clone, acc
+        (Vector([1.0, 61.5, 81.0, 2.0, 1.0]), Vector([0.0, 60.5, 80.0, 1.0]))
+        >>> pickle.loads(pickle.dumps(acc, protocol=5)) == acc
+        True
+        >>> view = MutableVector.frombytes(bytes(acc), copy=False)
+        >>> view += [1, 1]
+        >>> view, acc
+        (Vector([1.0, 61.5, 80.0, 1.0]), Vector([0.0, 60.5, 80.0, 1.0]))
+    """
+    __slots__ = ()
+
+    __hash__ = None
+
+    @classmethod
+    def zeros(cls, dim):
+        return cls._frombuffer(array(cls.typecode, [0]) * dim)
+
+    def _cache(self, name, value):
+        """The components change in place: nothing can be cached"""
+        return value
+
+    @classmethod
+    def _frombuffer(cls, memv):
+        """Copy views into an array of our own: a view could neither grow nor be
+        private. Unpickling, frombytes and iter_load with copy=False land here"""
+        if isinstance(memv, array):
+            return super()._frombuffer(memv)
+        memv = memoryview(memv)
+        components = array(memv.format)
+        components.frombytes(memv.cast('B'))
+        return super()._frombuffer(components)
+
+    def __setitem__(self, index, value):
+        self._components[index] = value
+
+    def _update(self, other, func, scalar=1):
+        """components[i] = func(components[i], other[i]), in place.
+        Nothing is written unless every component converts"""
+        components = self._components
+        # vectors of unknown typecode, like tuples, count as 'd', as in __add__
+        typecode = promote(self.typecode, getattr(other, 'typecode', 'd'))
+        typecode = promote_scalar(typecode, scalar)
+        try:
+            others = iter(other)
+            # map stops at the end of components before taking from others
+            head = array(typecode, map(func, components, others))
+            tail = array(typecode, (func(0, x) for x in others))
+        except TypeError:
+            return NotImplemented
+        self._store(head, tail)
+        return self
+
+    def _store(self, head, tail):
+        """Overwrite the first len(head) components with head, append tail"""
+        components = self._components
+        if head.typecode == components.typecode:
+            components[:len(head)] = head
+            components.extend(tail)
+        else:
+            rest = array(head.typecode, components[len(head):])
+            self._components = head + rest + tail
+
+    def __iadd__(self, other):
+        return self._update(other, operator.add)
+
+    def __isub__(self, other):
+        return self._update(other, operator.sub)
+
+    def add_scaled(self, other, k):
+        """axpy: self += other * k, in place, with no intermediate vector"""
+        if self._update(other, lambda a, x: a + x * k, k) is NotImplemented:
+            msg = 'add_scaled needs a vector and a number, not {!r} and {!r}'
+            raise TypeError(msg.format(type(other).__name__, type(k).__name__))
+        return self
+
+    def __imul__(self, scalar):
+        if isinstance(scalar, numbers.Real):
+            typecode = promote_scalar(self.typecode, scalar)
+            self._store(array(typecode, (x * scalar for x in self._components)), array(typecode))
+            return self
+        else:
+            return NotImplemented
+
+    def freeze(self):
+        # slicing an array copies its memory in one go
+        return Vector2._frombuffer(self._components[:])
+
+
+def _contents(tombola):
+    """The items of a Tombola as a list, through snapshot() when it has one:
+    virtual subclasses registered with Tombola may only have inspect()"""
+    snapshot = getattr(tombola, 'snapshot', None)
+    return snapshot() if snapshot is not None else list(tombola.inspect())
+
+
 class AddableBingoCage(BingoCage):
     """
     AddableBingoCage extends BingoCage to support + and +=
@@ -246,6 +456,12 @@ class AddableBingoCage(BingoCage):
     Traceback (most recent call last):
         ...
     TypeError: right operand in += must be 'AddableBingoCage' or an iterable
+    >>> from abc_tombola import TomboList
+    >>> len(globe + TomboList([1, 2])), len(globe)
+    (11, 9)
+    >>> globe += globe
+    >>> len(globe)
+    18
     """
 
     def __add__(self, other):
@@ -258,14 +474,14 @@ class AddableBingoCage(BingoCage):
           be invoked when dealing with an operand of a different type.
         """
         if isinstance(other, Tombola):
-            return AddableBingoCage(self.inspect() + other.inspect())
+            return AddableBingoCage(self.snapshot() + _contents(other))
         else:
             return NotImplemented
 
     def __iadd__(self, other):
         """Very important! augmented assignment special methods must return self"""
         if isinstance(other, Tombola):
-            other_iterable = other.inspect()
+            other_iterable = _contents(other)
         else:
             try:
                 # try to obtain an iterator over other
@@ -0,0 +1,112 @@
+"""
+Process-parallel reductions for very large vectors
+
+``abs(v)`` and ``v @ w`` run single-threaded through a generator expression.
+Above ``Vector.parallel_threshold`` components they switch to this backend:
+the components are copied ONCE into a ``multiprocessing.shared_memory``
+segment, and a process pool reduces fixed-size chunks of it. Workers attach
+to the segment by name, so the components are never pickled; only the chunk
+bounds travel to the workers, and only one float per chunk comes back.
+
+Results are deterministic: chunk boundaries depend only on ``chunk_size``,
+never on the number of workers or on scheduling, and the partial sums are
+combined with ``math.fsum``, which is exact before its final rounding.
+
+    >>> from array import array
+    >>> a = array('d', range(10))
+    >>> dot(a, a, chunk_size=3), sum_of_squares(a, chunk_size=3)
+    (285.0, 285.0)
+    >>> dot(a, array('d', [1, 1]))  # the shorter operand wins, like zip
+    1.0
+
+
+``Vector`` and ``Vector2`` switch to this backend automatically::
+
+    >>> from operator_overloading import Vector2
+    >>> class BigVector(Vector2):
+    ...     __slots__ = ()
+    ...     parallel_threshold = 4
+    >>> v = BigVector([3, 4, 0, 0, 0])
+    >>> abs(v), v @ BigVector(range(5))
+    (5.0, 4.0)
+    >>> shutdown()
+"""
+
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+import math
+from multiprocessing import shared_memory
+import operator
+
+CHUNK_SIZE = 2 ** 20  # components per task: fixed, so that results are deterministic
+
+_executor = None
+
+
+def _pool():
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor()
+    return _executor
+
+
+def shutdown():
+    """Stop the worker processes; the next reduction starts new ones"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown()
+        _executor = None
+
+
+def _chunk_dot(name, typecode, a_start, b_start, length):
+    """Runs in a worker: the dot product of one chunk of a and b"""
+    shm = shared_memory.SharedMemory(name=name)
+    items = shm.buf.cast(typecode)
+    a = items[a_start:a_start + length]
+    b = items[b_start:b_start + length]
+    try:
+        return sum(map(operator.mul, a, b))
+    finally:
+        # views must be released before the segment can be closed
+        for memv in (a, b, items):
+            memv.release()
+        shm.close()
+
+
+def reduce_segment(name, typecode, a_start, b_start, size, chunk_size=CHUNK_SIZE):
+    """Dot product of two runs of ``size`` items in the shared memory segment ``name``"""
+    pool = _pool()
+    futures = [pool.submit(_chunk_dot, name, typecode, a_start + start, b_start + start,
+                           min(chunk_size, size - start))
+               for start in range(0, size, chunk_size)]
+    # fsum of the partials, in chunk order: the same result on every run
+    return math.fsum(future.result() for future in futures)
+
+
+def dot(a, b, chunk_size=CHUNK_SIZE):
+    """Dot product of two buffers, in parallel"""
+    same = a is b  # a @ a: copy the components once
+    a, b = memoryview(a), memoryview(b)
+    size = min(len(a), len(b))
+    typecode = a.format if a.format == b.format else 'd'
+    itemsize = array(typecode).itemsize
+    nbytes = itemsize * size * (1 if same else 2)
+    shm = shared_memory.SharedMemory(create=True, size=max(1, nbytes))
+    try:
+        items = shm.buf.cast(typecode)
+        for start, memv in enumerate([a] if same else [a, b]):
+            target = items[start * size:(start + 1) * size]
+            if memv.format == typecode:
+                target[:] = memv[:size]
+            else:
+                target[:] = array(typecode, memv[:size])
+            target.release()
+        items.release()
+        return reduce_segment(shm.name, typecode, 0, 0 if same else size, size, chunk_size)
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def sum_of_squares(a, chunk_size=CHUNK_SIZE):
+    return dot(a, a, chunk_size)